@@ -0,0 +1,322 @@
+"""
+Benchmarks of conversion engine, run with `python bench/bench_engine.py`
+"""
+
+import os
+import random
+import sys
+import timeit
+from itertools import islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from engine import *
+from usage import UsageStore
+
+
+def measure(fun, number=20):
+    """
+    Returns average time of fun call in milliseconds
+    """
+    return timeit.timeit(fun, number=number) / number * 1000.0
+
+
+def plain_tables():
+    """
+    Snapshots of symbols and synonyms as plain dicts, as tables were before compact ones
+    Baselines scan them, not compact tables, iterating which is much slower
+    """
+    return dict(maths.direct.items()), dict(synonyms.direct.items())
+
+
+def scan_completions(prefix, symbols, syns):
+    """
+    Completions by scanning all names, as it was done before completion index
+    """
+    completions = [(k, v) for k, v in symbols.items() if k.startswith(prefix)]
+    completions.extend([(k, symbol_by_name(k)) for k in syns if k.startswith(prefix)])
+    return sorted(completions)
+
+
+def synthetic_text(size, seed=0):
+    """
+    Text of approximately size chars full of escapes
+    """
+    words = ['\\alpha', '\\forall', '\\to', 'x', 'foo', '\\in', '\\BbbN', '\\nosuch', '\\^2', '\\\\Bbb\\ABC']
+    rnd = random.Random(seed)
+    lines = []
+    total = 0
+    while total < size:
+        line = ' '.join(rnd.choice(words) for _ in range(10))
+        lines.append(line)
+        total += len(line) + 1
+    return '\n'.join(lines)
+
+
+def bench_completions():
+    print('completions by prefix, ms per query')
+    require_names()
+    symbols, syns = plain_tables()
+    index = completion_index()
+    for prefix in ['a', 's', ':', 'al', 'sq', ':s', 'alp', 'sqs', ':sm']:
+        print('  {0:<4} {1:>5} matches  scan {2:7.3f}  index {3:7.3f}'.format(
+            prefix,
+            len(index.completions(prefix)),
+            measure(lambda: scan_completions(prefix, symbols, syns)),
+            measure(lambda: index.completions(prefix))))
+
+
+def bench_convert_text():
+    text = synthetic_text(1 << 20)
+    print('convert_text, {0} chars: {1:.0f} ms'.format(len(text), measure(lambda: convert_text(text), number=3)))
+
+
+def scan_suffix(text, symbols):
+    """
+    Longest symbol at the end of text by trying every length, as find_rev did before reverse index
+    """
+    max_len = max(map(lambda v: len(v), symbols.values()))
+    for i in reversed(range(1, max_len + 1)):
+        if len(text) >= i and names_by_symbol(text[-i:]):
+            return i
+    return 0
+
+
+def bench_reverse():
+    index = reverse_index()
+    symbols, _ = plain_tables()
+    text = u'x \u2200 y \u2208 \u2115'
+    print('longest symbol at cursor: scan {0:.3f} ms, index {1:.4f} ms'.format(
+        measure(lambda: scan_suffix(text, symbols), number=200),
+        measure(lambda: index.longest_suffix(text), number=200)))
+    back = convert_text(synthetic_text(1 << 20))
+    print('convert_back_text, {0} chars: {1:.0f} ms'.format(len(back), measure(lambda: convert_back_text(back), number=3)))
+
+
+def recursive_replace_codes(s):
+    """
+    replace_codes as it was before, recursing on the rest of string after each code
+    """
+    if not s:
+        return s
+    m = CODE_RE.search(s)
+    if not m:
+        return s
+    return s[:m.start()] + symbol_by_code(s[m.start():m.end()]) + recursive_replace_codes(s[m.end():])
+
+
+def recursive_symbol_by_name(name, symbols, syns, exclude=None):
+    """
+    symbol_by_name as it was before, following synonyms by recursion
+    """
+    if exclude is None:
+        exclude = []
+    if name in exclude:
+        return None
+    if name in symbols:
+        return symbols[name]
+    if name in syns:
+        exclude.append(name)
+        return recursive_symbol_by_name(syns[name], symbols, syns, exclude)
+    return None
+
+
+def bench_lookup():
+    names = ['upalpha', 'alpha', 'to', 'nosuch']
+    symbols, syns = plain_tables()
+    print('symbol_by_name, us per lookup')
+    for name in names:
+        print('  {0:<8} recursive {1:6.3f}  resolved {2:6.3f}'.format(
+            name,
+            measure(lambda: recursive_symbol_by_name(name, symbols, syns), number=100000) * 1000,
+            measure(lambda: symbol_by_name(name), number=100000) * 1000))
+
+
+def bench_codes():
+    print('decode codes, ms')
+    for count in [500, 10000, 100000]:
+        text = u'x \\u2200 \\U0001D538 \\U+1F600' * (count // 3)
+        try:
+            recursive = '{0:9.2f}'.format(measure(lambda: recursive_replace_codes(text), number=3))
+        except RecursionError:
+            recursive = '{0:>9}'.format('overflow')
+        print('  {0:>6} escapes  recursive {1}  replace_codes {2:7.2f}  stream {3:7.2f}'.format(
+            count // 3 * 3,
+            recursive,
+            measure(lambda: replace_codes(text), number=3),
+            measure(lambda: ''.join(decode_codes_stream(text[i:i + 65536] for i in range(0, len(text), 65536))), number=3)))
+
+
+def bench_prefix():
+    print('escape at cursor on single line, us')
+    for size in [100, 10000, 1000000]:
+        # With separators and without any, e.g. long url or base64 text before escape
+        for kind, line in [
+                ('text', synthetic_text(size).replace('\n', ' ') + ' \\alpha'),
+                ('solid', 'x' * size + '\\alpha')]:
+            for name, regex in [('symbol', UNICODE_SYMBOL_PREFIX_RE), ('list', UNICODE_PREFIX_RE)]:
+                print('  {0:>7} chars {1:<5} {2:<6}  whole line {3:10.2f}  bounded {4:6.2f}'.format(
+                    len(line), kind, name,
+                    measure(lambda: regex.search(line[0:len(line)]), number=10) * 1000,
+                    measure(lambda: search_prefix(lambda b, e: line[b:e], 0, len(line), regex), number=1000) * 1000))
+
+
+def bench_keystroke():
+    """
+    Work done on each typed char with instant conversion: escape at cursor, then its replacement
+    """
+    typed = u'for \\alpha x \\in \\BbbN, \\^2 \\forall y \\to z \\nosuch ' * 5
+    prefix_re = prefix_regex()
+    line = u'plain text before escapes ' * 40
+
+    def type_all():
+        text = line
+        for ch in typed:
+            text += ch
+            m = search_prefix(lambda b, e: text[b:e], 0, len(text), prefix_re)
+            if m:
+                replacement(m, instant=True)
+
+    print('typed {0} chars with instant conversion, us per keystroke'.format(len(typed)))
+    cached_replacement.cache_clear()
+    print('  first pass {0:7.2f}  cached {1:7.2f}'.format(
+        measure(type_all, number=1) * 1000 / len(typed),
+        measure(type_all, number=20) * 1000 / len(typed)))
+
+
+def bench_ranking():
+    usage = UsageStore()
+    rnd = random.Random(0)
+    names = rnd.sample(list(maths.direct), 100)
+    for _ in range(1000):
+        usage.record(rnd.choice(names))
+    index = completion_index()
+
+    def sort_all(prefix):
+        scores = usage.scores
+        return sorted(index.completions(prefix), key=lambda pair: -scores.get(pair[0], 0.0))[:100]
+
+    def top_k(prefix):
+        pairs = [(name, symbol_by_name(name)) for name in usage.top(prefix, 100)]
+        used = set(name for name, _ in pairs)
+        rest = (pair for pair in index.iter_completions(prefix) if pair[0] not in used)
+        return pairs + list(islice(rest, 100 - len(pairs)))
+
+    print('100 most used completions for 1 char prefixes, ms')
+    for prefix in ['b', 'm', 's', ':']:
+        assert sort_all(prefix) == top_k(prefix)
+        print('  {0}  {1:5} matches  sort all {2:6.3f}  top-k {3:6.3f}'.format(
+            prefix, len(index.completions(prefix)),
+            measure(lambda: sort_all(prefix)),
+            measure(lambda: top_k(prefix))))
+
+
+def naive_search(query, limit):
+    """
+    Search by scoring every name, as trigram index does for its candidates
+    """
+    exact, query = query, query.lower()
+    query_trigrams = trigrams(query)
+    total = len(query_trigrams)
+    scored = []
+    for name in completion_index().extensions(u''):
+        key = name.lower()
+        if total:
+            shared = len(query_trigrams & trigrams(key))
+            if 2 * shared < total and not (shared and is_subsequence(query, key)):
+                continue
+            score = SearchIndex.score(query, key, shared, total)
+        elif query in key:
+            score = SearchIndex.score(query, key, 1, 1)
+        else:
+            continue
+        scored.append((-score - 0.5 * (exact in name), name))
+    return [name for _, name in sorted(scored)[:limit]]
+
+
+def bench_search():
+    index = search_index()
+    print('fuzzy search, 20 best, ms')
+    for query in ['al', 'sqsub', 'lsqsub', 'rightarr', 'forll', 'smiling-cat']:
+        assert naive_search(query, 20) == index.search(query, 20), query
+        print('  {0:<12} naive scan {1:7.3f}  trigram index {2:6.3f}'.format(
+            query,
+            measure(lambda: naive_search(query, 20), number=5),
+            measure(lambda: index.search(query, 20), number=100)))
+
+
+def bench_families():
+    index = completion_index()
+    print('family prefixes, 100 completions / fuzzy search, 20 best, ms')
+    for query in [u':', u':smi', u'^', u'mbf', u'Bbb']:
+        family = name_family(query)
+        print('  {0:<6} {1:<9} {2:5} names  flat {3:6.3f} {4:6.3f}  partition {5:6.3f} {6:6.3f}'.format(
+            query, family, len(index.partition(family).names),
+            measure(lambda: list(islice(index.sorted_completions(query), 100)), number=100),
+            measure(lambda: search_index().search(query, 20), number=100),
+            measure(lambda: list(islice(index.iter_completions(query), 100)), number=100),
+            measure(lambda: search_index(family).search(query, 20), number=100)))
+
+
+def lookup_stylize(text, style):
+    """
+    Stylize by looking up name of each char, as list conversion did
+    """
+    return u''.join(symbol_by_name(style + ch) or ch for ch in text)
+
+
+def bench_stylize():
+    text = synthetic_text(100000)
+    plain = u''.join(ch if ch.isalpha() and ord(ch) < 128 else u' ' for ch in text)
+    print('stylize 100 KB, ms')
+    for style in ['mbf', 'Bbb', 'mscr']:
+        assert lookup_stylize(plain, style) == stylize(plain, style), style
+        print('  {0:<5} lookup by name {1:8.2f}  translate {2:6.2f}'.format(
+            style,
+            measure(lambda: lookup_stylize(text, style), number=3),
+            measure(lambda: stylize(text, style), number=20)))
+
+
+def lookup_script(text, script_char):
+    """
+    Script conversion by looking up name of each char, as escapes did
+    """
+    return u''.join(symbol_by_name(script_char + ch) or ch for ch in text)
+
+
+def bench_scripts():
+    text = u' '.join(['H2O', 'CO2', '(n+1)', 'x2', 'e-', 'Ca2+', 'k=0'] * 15000)
+    print('script {0} KB, ms'.format(len(text) // 1000))
+    for script_char in ['^', '_']:
+        assert lookup_script(text, script_char) == convert_script_text(text, script_char, partial=True)[0]
+        print('  {0}  lookup by name {1:8.2f}  translate {2:6.2f}  whole words {3:6.2f}'.format(
+            script_char,
+            measure(lambda: lookup_script(text, script_char), number=3),
+            measure(lambda: convert_script_text(text, script_char, partial=True), number=20),
+            measure(lambda: convert_script_text(text, script_char), number=20)))
+
+
+def bench_lazy():
+    """
+    Run before anything needs emoji, they are loaded once per process
+    """
+    assert not maths.lazy_loaded
+    print('emoji loaded on first lookup: {0:.2f} ms'.format(
+        measure(lambda: symbol_by_name(u':grinning-face'), number=1)))
+
+
+if __name__ == '__main__':
+    load_tables()
+    bench_lazy()
+    bench_completions()
+    bench_convert_text()
+    bench_reverse()
+    bench_codes()
+    bench_lookup()
+    bench_prefix()
+    bench_keystroke()
+    bench_ranking()
+    bench_search()
+    bench_families()
+    bench_stylize()
+    bench_scripts()
@@ -0,0 +1,388 @@
+"""
+Conversion engine: escape regexes and replacement logic on top of symbol tables
+Doesn't depend on sublime, so it can be used outside of editor
+"""
+
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+try:
+    from .mathsymbols import *
+except (ImportError, ValueError):
+    from mathsymbols import *
+
+
+UNICODE_SYMBOL_RE = re.compile(r'(?:\\)(?P<symbol>[^\s\\\.,]+)')
+UNICODE_RE = re.compile(r'(?:\\)(?:(?P<symbol>[^\s\\\.,]+)|(?:\\(?P<prefix>[^\s\\\.,]+)\\(?P<chars>[^\s\\\.,]+)))')
+UNICODE_SYMBOL_PREFIX_RE = re.compile(r'(?:\\)(?P<symbol>[^\\]+)$')
+UNICODE_PREFIX_RE = re.compile(r'(?:\\)(?:(?P<symbol>[^\\]+)|(?:\\(?P<prefix>[^\s\\\.,]+)\\(?P<chars>[^\s\\\.,]+ ?)))$')
+
+
+class Config(namedtuple('Config', ['accept_prefixes', 'convert_sub_super', 'convert_codes', 'convert_list'])):
+    """
+    Conversion flags, defaults are the same as in UnicodeMath.sublime-settings
+    """
+    __slots__ = ()
+
+    def __new__(cls, accept_prefixes=False, convert_sub_super=True, convert_codes=True, convert_list=True):
+        return super(Config, cls).__new__(cls, accept_prefixes, convert_sub_super, convert_codes, convert_list)
+
+DEFAULT_CONFIG = Config()
+
+
+def load_tables(user_symbols=None, user_synonyms=None):
+    """
+    Fills symbol tables with built-in entries and user ones
+    """
+    maths.update(user_symbols or {})
+    synonyms.update(user_synonyms or {})
+
+
+def map_tables(cache_dir):
+    """
+    Maps built-in symbol tables from files in cache_dir, files are written on first use
+    All processes mapping tables from the same directory share one copy of them
+    """
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    maths.map_builtin(os.path.join(cache_dir, 'maths.table'))
+    synonyms.map_builtin(os.path.join(cache_dir, 'synonyms.table'))
+
+
+def search_regex(config=DEFAULT_CONFIG):
+    """
+    Regex to find escapes in text
+    """
+    return UNICODE_RE if config.convert_list else UNICODE_SYMBOL_RE
+
+
+def prefix_regex(config=DEFAULT_CONFIG):
+    """
+    Regex to find escape at the end of text
+    """
+    return UNICODE_PREFIX_RE if config.convert_list else UNICODE_SYMBOL_PREFIX_RE
+
+
+@generation_cached
+def longest_escape_name():
+    """
+    Length of longest name, that can be escaped (emoji too, even if not loaded)
+    """
+    return max([maths.longest_name()] + [len(name) for name in resolved_names()[0]])
+
+
+def max_escape_length():
+    """
+    Longest escape, that is looked for at cursor: prefix escape with prefix and chars
+    not longer than longest name, plus trailing space
+    Longer subscripts and lists are still converted in selections
+    """
+    return 2 * longest_escape_name() + 4
+
+
+PREFIX_TAIL_RE = re.compile(r'\\?[^\s\\\.,]*\Z')
+
+
+def search_prefix(read, line_start, location, prefix_re):
+    """
+    Searches escape ending at location with prefix_re, read(begin, end) returns text
+    Reads at most max_escape_length() chars back; if text before match may be tail
+    of cut \\prefix\, reads again at most longest name and two backslashes earlier
+    """
+    begin = max(line_start, location - max_escape_length())
+    text = read(begin, location)
+    m = prefix_re.search(text)
+    if m and begin > line_start and m.start() <= longest_escape_name() + 1 and PREFIX_TAIL_RE.match(text[:m.start()]):
+        m = prefix_re.search(read(max(line_start, begin - longest_escape_name() - 2), location))
+    return m
+
+
+def is_script(s):
+    """
+    Subscript _... or superscript ^...
+    """
+    return s.startswith('_') or s.startswith('^')
+
+
+REPLACEMENT_CACHE_SIZE = 4096
+
+
+def replacement(m, instant=False, config=DEFAULT_CONFIG):
+    """
+    Returns the conversion for regex match m (with groups 'symbol', 'prefix'
+    and 'chars'), None if no conversion is possible.
+    If instant=True, restricts to conversions suitable for instant insertion
+    """
+    groups = m.groupdict()
+    return cached_replacement(
+        groups.get('symbol'), groups.get('prefix'), groups.get('chars'),
+        instant, config, tables_generation())
+
+
+def replacement_cache_info():
+    """
+    Returns hits, misses, maxsize and currsize of replacement cache
+    """
+    return cached_replacement.cache_info()
+
+
+@lru_cache(maxsize=REPLACEMENT_CACHE_SIZE)
+def cached_replacement(symbol, prefix, chars, instant, config, generation):
+    """
+    Conversion for groups of escape match
+    Tables generation is part of cache key, so updating symbols or synonyms
+    invalidates cached results, as do changed flags in config
+    """
+    if symbol is not None:
+        # Accept explicit symbol names; in instant mode, refuse \^... and \_...
+        # (which are left to subs/supers) and ambigous prefixes
+        rep = symbol_by_name(symbol)
+        if rep and (not instant or (not is_script(symbol) and symbol_by_prefix(symbol, unique=True))):
+            return rep
+
+        # Convert unambiguous prefixes
+        if config.accept_prefixes:
+            rep = symbol_by_prefix(symbol, unique=True)
+            if rep:
+                return rep
+
+        # Convert subscript and superscripts, but not in instant mode (it would
+        # convert immediately at \^ or \_)
+        if config.convert_sub_super and is_script(symbol) and (not instant or symbol.endswith(" ")):
+            # Whitespace has no script form, it's kept as is only in text mode
+            script = symbol.strip()
+            rep, missing = convert_script_text(script[1:], script[0])
+            if not missing and not any(ch.isspace() for ch in script[1:]):
+                return rep
+
+        # Convert Unicode codes
+        if config.convert_codes:
+            rep = symbol_by_code(u'\\' + symbol)
+            if rep:
+                return rep
+
+        # In instant mode, accept symbols when followed by an invalid character.
+        # For instance, when typing "x" in "\alphax", recognize that "\alpha"
+        # was completed, and replace it.
+        if instant and symbol is not None and len(symbol) > 1 and not is_script(symbol):
+            prefix, suffix = symbol[:-1], symbol[-1]
+            rep = symbol_by_name(prefix)
+            comp_full = symbol_by_prefix(symbol, unique=False)
+
+            if rep and not comp_full:
+                rep = symbol_by_name(prefix)
+                if rep:
+                    return rep + suffix
+
+    # Substitute prefix combinations (\\prefix\...)
+    if prefix is not None and (not instant or chars and chars.endswith(" ")):
+        if prefix in ALPHABET_STYLES:
+            rep = alphabet_text(prefix, chars.strip())
+            if rep is not None:
+                return rep
+        reps = [symbol_by_name(prefix + ch) for ch in chars.strip()]
+        if all(reps):
+            return ''.join(reps)
+
+
+def convert_text(text, instant=False, config=DEFAULT_CONFIG):
+    """
+    Converts all escapes in text, escapes without conversion are left as is
+    """
+    def converted(m):
+        rep = replacement(m, instant, config)
+        return m.group(0) if rep is None else rep
+    return search_regex(config).sub(converted, text)
+
+
+def convert_script_text(text, script_char, partial=False):
+    """
+    Converts text to superscript ('^') or subscript ('_') in one pass, returns pair
+    (converted, missing), where missing is set of chars without such form
+    If partial=True, these chars are left as is, otherwise words with them are left
+    as is; whitespace is always kept
+    """
+    table = script_table(script_char)
+    missing = set(ch for ch in set(text) if ord(ch) not in table and not ch.isspace())
+    if partial or not missing:
+        return (text.translate(table), missing)
+    chars = u''.join(re.escape(ch) for ch in missing)
+    result = []
+    done = 0
+    for m in re.finditer(u'[^\\s{0}]*[{0}]\\S*'.format(chars), text):
+        result.append(text[done:m.start()].translate(table))
+        result.append(m.group(0))
+        done = m.end()
+    result.append(text[done:].translate(table))
+    return (u''.join(result), missing)
+
+
+NON_ASCII_RE = re.compile(r'[^\x00-\x7f]+')
+
+
+BACK_POLICIES = ('name', 'shortest', 'code')
+
+
+def back_escape(symbol, policy='name'):
+    """
+    Returns escape for symbol according to policy:
+        'name' - main name
+        'shortest' - shortest of main name and synonyms
+        'code' - unicode codes
+    """
+    return cached_back_escape(symbol, policy, tables_generation())
+
+
+@lru_cache(maxsize=REPLACEMENT_CACHE_SIZE)
+def cached_back_escape(symbol, policy, generation):
+    """
+    Escape for symbol, names are looked up in compact tables by bisect, so
+    escapes are cached until symbols or synonyms are updated
+    """
+    if policy == 'code':
+        return u''.join(code_by_symbol(c) for c in symbol)
+    names = names_by_symbol(symbol)
+    if policy == 'shortest':
+        return u'\\' + min(names, key=len)
+    if policy == 'name':
+        return u'\\' + names[0]
+    raise ValueError('Unknown convert back policy: {0}'.format(policy))
+
+
+def convert_back_text(text, policy='name', unknown_to_code=False):
+    """
+    Converts all non-ASCII symbols in text back to escapes in one pass
+    If unknown_to_code=True, chars without name are converted to codes, otherwise left as is
+    Space is inserted after escape, when next char would continue it
+    """
+    index = reverse_index()
+    result = []
+    done = 0
+    for run in NON_ASCII_RE.finditer(text):
+        # Match symbols from the end of run back, symbols may start with ASCII
+        # chars before run, but not before already converted text
+        pieces = []
+        end = run.end()
+        while end > run.start():
+            size = index.longest_suffix(text, end, done)
+            if size:
+                escape = back_escape(text[end - size:end], policy)
+            else:
+                size = 1
+                escape = code_by_symbol(text[end - 1]) if unknown_to_code or policy == 'code' else None
+            if escape is None:
+                pieces.append(text[end - 1])
+            else:
+                following = pieces[-1][0] if pieces else text[end:end + 1]
+                if following and not (is_separator(following) or following == '\\'):
+                    escape += u' '
+                pieces.append(escape)
+            end -= size
+        result.append(text[done:end])
+        result.extend(reversed(pieces))
+        done = run.end()
+    result.append(text[done:])
+    return u''.join(result)
+
+
+def is_separator(ch):
+    """
+    Escapes never contain whitespace, '.' or ','
+    """
+    return ch.isspace() or ch == '.' or ch == ','
+
+
+def is_ascii_space(ch):
+    return ch == ' ' or ch == '\t' or ch == '\n' or ch == '\r'
+
+
+def split_point(text, separator=is_separator):
+    """
+    Returns position after last separator in text, 0 if there is no separator
+    Text can be split there without splitting any escape
+    """
+    for i in range(len(text) - 1, -1, -1):
+        if separator(text[i]):
+            return i + 1
+    return 0
+
+
+MAX_RUN = 1 << 20
+
+
+def transform_pieces(chunks, fun, separator=is_separator, cut_before=None, max_run=MAX_RUN):
+    """
+    Applies fun to text given as iterable of chunks, yields pairs (source, result)
+    Chunks are rejoined at separators, so that no escape or symbol is split between
+    pieces; only new chunk is scanned for separator
+    Run of non-separators longer than max_run is cut before last cut_before char in it
+    (or at its end), so memory use is bounded by max_run and chunk size, but escape
+    or symbol across such cut is left unconverted
+    """
+    rest = u''
+    for chunk in chunks:
+        i = split_point(chunk, separator)
+        if i:
+            source = rest + chunk[:i]
+            rest = chunk[i:]
+            yield (source, fun(source))
+        else:
+            rest += chunk
+        if len(rest) > max_run:
+            i = rest.rfind(cut_before) if cut_before else -1
+            if i <= 0:
+                i = len(rest)
+            source, rest = rest[:i], rest[i:]
+            yield (source, fun(source))
+    if rest:
+        yield (rest, fun(rest))
+
+
+def convert_pieces(chunks, instant=False, config=DEFAULT_CONFIG):
+    """
+    Converts text given as iterable of chunks, yields pairs (source, converted)
+    """
+    return transform_pieces(chunks, lambda text: convert_text(text, instant, config), cut_before=u'\\')
+
+
+def convert_stream(chunks, instant=False, config=DEFAULT_CONFIG):
+    """
+    Converts text given as iterable of chunks, yields converted chunks
+    """
+    for _, converted in convert_pieces(chunks, instant, config):
+        yield converted
+
+
+def convert_back_pieces(chunks, policy='name', unknown_to_code=False):
+    """
+    Converts symbols back in text given as iterable of chunks, yields pairs (source, converted)
+    Split only at ASCII spaces, as other spaces may be converted to names
+    """
+    return transform_pieces(
+        chunks,
+        lambda text: convert_back_text(text, policy, unknown_to_code),
+        is_ascii_space)
+
+
+def convert_script_pieces(chunks, script_char, partial=False, missing=None):
+    """
+    Converts text given as iterable of chunks to script, yields pairs (source, converted)
+    Chars without script form are added to set missing, if it's given
+    Split only at ASCII spaces, so that words are not split
+    """
+    def convert(text):
+        converted, chars = convert_script_text(text, script_char, partial)
+        if missing is not None:
+            missing.update(chars)
+        return converted
+    return transform_pieces(chunks, convert, is_ascii_space)
+
+
+def convert_back_stream(chunks, policy='name', unknown_to_code=False):
+    """
+    Converts symbols back in text given as iterable of chunks, yields converted chunks
+    """
+    for _, converted in convert_back_pieces(chunks, policy, unknown_to_code):
+        yield converted
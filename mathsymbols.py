@@ -1,9 +1,22 @@
-import sublime
 import bisect
+import heapq
+import mmap
+import os
 import re
+import struct
+import sys
+import zlib
+from array import array
+from functools import wraps
+from heapq import merge
 from itertools import chain
 from sys import version
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
 PyV3 = version[0] == "3"
 
 
@@ -173,56 +186,25 @@ def make_maths():
         "underleftarrow": u"\U000020EE",
         "underrightarrow": u"\U000020EF",
         "asteraccent": u"\U000020F0",
-        "BbbC": u"\U00002102",
         "Eulerconst": u"\U00002107",
-        "mscrg": u"\U0000210A",
-        "mscrH": u"\U0000210B",
-        "mfrakH": u"\U0000210C",
-        "BbbH": u"\U0000210D",
         "Planckconst": u"\U0000210E",
         "hslash": u"\U0000210F",
-        "mscrI": u"\U00002110",
         "Im": u"\U00002111",
-        "mscrL": u"\U00002112",
         "ell": u"\U00002113",
-        "BbbN": u"\U00002115",
         "wp": u"\U00002118",
-        "BbbP": u"\U00002119",
-        "BbbQ": u"\U0000211A",
-        "mscrR": u"\U0000211B",
         "Re": u"\U0000211C",
-        "BbbR": u"\U0000211D",
-        "BbbZ": u"\U00002124",
         "mho": u"\U00002127",
-        "mfrakZ": u"\U00002128",
         "turnediota": u"\U00002129",
         "Angstrom": u"\U0000212B",
-        "mscrB": u"\U0000212C",
-        "mfrakC": u"\U0000212D",
-        "mscre": u"\U0000212F",
-        "mscrE": u"\U00002130",
-        "mscrF": u"\U00002131",
         "Finv": u"\U00002132",
-        "mscrM": u"\U00002133",
-        "mscro": u"\U00002134",
         "aleph": u"\U00002135",
         "beth": u"\U00002136",
         "gimel": u"\U00002137",
         "daleth": u"\U00002138",
-        "Bbbpi": u"\U0000213C",
-        "Bbbgamma": u"\U0000213D",
-        "BbbGamma": u"\U0000213E",
-        "BbbPi": u"\U0000213F",
-        "Bbbsum": u"\U00002140",
         "Game": u"\U00002141",
         "sansLturned": u"\U00002142",
         "sansLmirrored": u"\U00002143",
         "Yup": u"\U00002144",
-        "mitBbbD": u"\U00002145",
-        "mitBbbd": u"\U00002146",
-        "mitBbbe": u"\U00002147",
-        "mitBbbi": u"\U00002148",
-        "mitBbbj": u"\U00002149",
         "PropertyLine": u"\U0000214A",
         "upand": u"\U0000214B",
         "leftarrow": u"\U00002190",
@@ -1456,1004 +1438,349 @@ def make_maths():
         "Lbrbrak": u"\U00003018",
         "Rbrbrak": u"\U00003019",
         "hzigzag": u"\U00003030",
-        "mbfA": u"\U0001D400",
-        "mbfB": u"\U0001D401",
-        "mbfC": u"\U0001D402",
-        "mbfD": u"\U0001D403",
-        "mbfE": u"\U0001D404",
-        "mbfF": u"\U0001D405",
-        "mbfG": u"\U0001D406",
-        "mbfH": u"\U0001D407",
-        "mbfI": u"\U0001D408",
-        "mbfJ": u"\U0001D409",
-        "mbfK": u"\U0001D40A",
-        "mbfL": u"\U0001D40B",
-        "mbfM": u"\U0001D40C",
-        "mbfN": u"\U0001D40D",
-        "mbfO": u"\U0001D40E",
-        "mbfP": u"\U0001D40F",
-        "mbfQ": u"\U0001D410",
-        "mbfR": u"\U0001D411",
-        "mbfS": u"\U0001D412",
-        "mbfT": u"\U0001D413",
-        "mbfU": u"\U0001D414",
-        "mbfV": u"\U0001D415",
-        "mbfW": u"\U0001D416",
-        "mbfX": u"\U0001D417",
-        "mbfY": u"\U0001D418",
-        "mbfZ": u"\U0001D419",
-        "mbfa": u"\U0001D41A",
-        "mbfb": u"\U0001D41B",
-        "mbfc": u"\U0001D41C",
-        "mbfd": u"\U0001D41D",
-        "mbfe": u"\U0001D41E",
-        "mbff": u"\U0001D41F",
-        "mbfg": u"\U0001D420",
-        "mbfh": u"\U0001D421",
-        "mbfi": u"\U0001D422",
-        "mbfj": u"\U0001D423",
-        "mbfk": u"\U0001D424",
-        "mbfl": u"\U0001D425",
-        "mbfm": u"\U0001D426",
-        "mbfn": u"\U0001D427",
-        "mbfo": u"\U0001D428",
-        "mbfp": u"\U0001D429",
-        "mbfq": u"\U0001D42A",
-        "mbfr": u"\U0001D42B",
-        "mbfs": u"\U0001D42C",
-        "mbft": u"\U0001D42D",
-        "mbfu": u"\U0001D42E",
-        "mbfv": u"\U0001D42F",
-        "mbfw": u"\U0001D430",
-        "mbfx": u"\U0001D431",
-        "mbfy": u"\U0001D432",
-        "mbfz": u"\U0001D433",
-        "mitA": u"\U0001D434",
-        "mitB": u"\U0001D435",
-        "mitC": u"\U0001D436",
-        "mitD": u"\U0001D437",
-        "mitE": u"\U0001D438",
-        "mitF": u"\U0001D439",
-        "mitG": u"\U0001D43A",
-        "mitH": u"\U0001D43B",
-        "mitI": u"\U0001D43C",
-        "mitJ": u"\U0001D43D",
-        "mitK": u"\U0001D43E",
-        "mitL": u"\U0001D43F",
-        "mitM": u"\U0001D440",
-        "mitN": u"\U0001D441",
-        "mitO": u"\U0001D442",
-        "mitP": u"\U0001D443",
-        "mitQ": u"\U0001D444",
-        "mitR": u"\U0001D445",
-        "mitS": u"\U0001D446",
-        "mitT": u"\U0001D447",
-        "mitU": u"\U0001D448",
-        "mitV": u"\U0001D449",
-        "mitW": u"\U0001D44A",
-        "mitX": u"\U0001D44B",
-        "mitY": u"\U0001D44C",
-        "mitZ": u"\U0001D44D",
-        "mita": u"\U0001D44E",
-        "mitb": u"\U0001D44F",
-        "mitc": u"\U0001D450",
-        "mitd": u"\U0001D451",
-        "mite": u"\U0001D452",
-        "mitf": u"\U0001D453",
-        "mitg": u"\U0001D454",
-        "miti": u"\U0001D456",
-        "mitj": u"\U0001D457",
-        "mitk": u"\U0001D458",
-        "mitl": u"\U0001D459",
-        "mitm": u"\U0001D45A",
-        "mitn": u"\U0001D45B",
-        "mito": u"\U0001D45C",
-        "mitp": u"\U0001D45D",
-        "mitq": u"\U0001D45E",
-        "mitr": u"\U0001D45F",
-        "mits": u"\U0001D460",
-        "mitt": u"\U0001D461",
-        "mitu": u"\U0001D462",
-        "mitv": u"\U0001D463",
-        "mitw": u"\U0001D464",
-        "mitx": u"\U0001D465",
-        "mity": u"\U0001D466",
-        "mitz": u"\U0001D467",
-        "mbfitA": u"\U0001D468",
-        "mbfitB": u"\U0001D469",
-        "mbfitC": u"\U0001D46A",
-        "mbfitD": u"\U0001D46B",
-        "mbfitE": u"\U0001D46C",
-        "mbfitF": u"\U0001D46D",
-        "mbfitG": u"\U0001D46E",
-        "mbfitH": u"\U0001D46F",
-        "mbfitI": u"\U0001D470",
-        "mbfitJ": u"\U0001D471",
-        "mbfitK": u"\U0001D472",
-        "mbfitL": u"\U0001D473",
-        "mbfitM": u"\U0001D474",
-        "mbfitN": u"\U0001D475",
-        "mbfitO": u"\U0001D476",
-        "mbfitP": u"\U0001D477",
-        "mbfitQ": u"\U0001D478",
-        "mbfitR": u"\U0001D479",
-        "mbfitS": u"\U0001D47A",
-        "mbfitT": u"\U0001D47B",
-        "mbfitU": u"\U0001D47C",
-        "mbfitV": u"\U0001D47D",
-        "mbfitW": u"\U0001D47E",
-        "mbfitX": u"\U0001D47F",
-        "mbfitY": u"\U0001D480",
-        "mbfitZ": u"\U0001D481",
-        "mbfita": u"\U0001D482",
-        "mbfitb": u"\U0001D483",
-        "mbfitc": u"\U0001D484",
-        "mbfitd": u"\U0001D485",
-        "mbfite": u"\U0001D486",
-        "mbfitf": u"\U0001D487",
-        "mbfitg": u"\U0001D488",
-        "mbfith": u"\U0001D489",
-        "mbfiti": u"\U0001D48A",
-        "mbfitj": u"\U0001D48B",
-        "mbfitk": u"\U0001D48C",
-        "mbfitl": u"\U0001D48D",
-        "mbfitm": u"\U0001D48E",
-        "mbfitn": u"\U0001D48F",
-        "mbfito": u"\U0001D490",
-        "mbfitp": u"\U0001D491",
-        "mbfitq": u"\U0001D492",
-        "mbfitr": u"\U0001D493",
-        "mbfits": u"\U0001D494",
-        "mbfitt": u"\U0001D495",
-        "mbfitu": u"\U0001D496",
-        "mbfitv": u"\U0001D497",
-        "mbfitw": u"\U0001D498",
-        "mbfitx": u"\U0001D499",
-        "mbfity": u"\U0001D49A",
-        "mbfitz": u"\U0001D49B",
-        "mscrA": u"\U0001D49C",
-        "mscrC": u"\U0001D49E",
-        "mscrD": u"\U0001D49F",
-        "mscrG": u"\U0001D4A2",
-        "mscrJ": u"\U0001D4A5",
-        "mscrK": u"\U0001D4A6",
-        "mscrN": u"\U0001D4A9",
-        "mscrO": u"\U0001D4AA",
-        "mscrP": u"\U0001D4AB",
-        "mscrQ": u"\U0001D4AC",
-        "mscrS": u"\U0001D4AE",
-        "mscrT": u"\U0001D4AF",
-        "mscrU": u"\U0001D4B0",
-        "mscrV": u"\U0001D4B1",
-        "mscrW": u"\U0001D4B2",
-        "mscrX": u"\U0001D4B3",
-        "mscrY": u"\U0001D4B4",
-        "mscrZ": u"\U0001D4B5",
-        "mscra": u"\U0001D4B6",
-        "mscrb": u"\U0001D4B7",
-        "mscrc": u"\U0001D4B8",
-        "mscrd": u"\U0001D4B9",
-        "mscrf": u"\U0001D4BB",
-        "mscrh": u"\U0001D4BD",
-        "mscri": u"\U0001D4BE",
-        "mscrj": u"\U0001D4BF",
-        "mscrk": u"\U0001D4C0",
-        "mscrl": u"\U0001D4C1",
-        "mscrm": u"\U0001D4C2",
-        "mscrn": u"\U0001D4C3",
-        "mscrp": u"\U0001D4C5",
-        "mscrq": u"\U0001D4C6",
-        "mscrr": u"\U0001D4C7",
-        "mscrs": u"\U0001D4C8",
-        "mscrt": u"\U0001D4C9",
-        "mscru": u"\U0001D4CA",
-        "mscrv": u"\U0001D4CB",
-        "mscrw": u"\U0001D4CC",
-        "mscrx": u"\U0001D4CD",
-        "mscry": u"\U0001D4CE",
-        "mscrz": u"\U0001D4CF",
-        "mbfscrA": u"\U0001D4D0",
-        "mbfscrB": u"\U0001D4D1",
-        "mbfscrC": u"\U0001D4D2",
-        "mbfscrD": u"\U0001D4D3",
-        "mbfscrE": u"\U0001D4D4",
-        "mbfscrF": u"\U0001D4D5",
-        "mbfscrG": u"\U0001D4D6",
-        "mbfscrH": u"\U0001D4D7",
-        "mbfscrI": u"\U0001D4D8",
-        "mbfscrJ": u"\U0001D4D9",
-        "mbfscrK": u"\U0001D4DA",
-        "mbfscrL": u"\U0001D4DB",
-        "mbfscrM": u"\U0001D4DC",
-        "mbfscrN": u"\U0001D4DD",
-        "mbfscrO": u"\U0001D4DE",
-        "mbfscrP": u"\U0001D4DF",
-        "mbfscrQ": u"\U0001D4E0",
-        "mbfscrR": u"\U0001D4E1",
-        "mbfscrS": u"\U0001D4E2",
-        "mbfscrT": u"\U0001D4E3",
-        "mbfscrU": u"\U0001D4E4",
-        "mbfscrV": u"\U0001D4E5",
-        "mbfscrW": u"\U0001D4E6",
-        "mbfscrX": u"\U0001D4E7",
-        "mbfscrY": u"\U0001D4E8",
-        "mbfscrZ": u"\U0001D4E9",
-        "mbfscra": u"\U0001D4EA",
-        "mbfscrb": u"\U0001D4EB",
-        "mbfscrc": u"\U0001D4EC",
-        "mbfscrd": u"\U0001D4ED",
-        "mbfscre": u"\U0001D4EE",
-        "mbfscrf": u"\U0001D4EF",
-        "mbfscrg": u"\U0001D4F0",
-        "mbfscrh": u"\U0001D4F1",
-        "mbfscri": u"\U0001D4F2",
-        "mbfscrj": u"\U0001D4F3",
-        "mbfscrk": u"\U0001D4F4",
-        "mbfscrl": u"\U0001D4F5",
-        "mbfscrm": u"\U0001D4F6",
-        "mbfscrn": u"\U0001D4F7",
-        "mbfscro": u"\U0001D4F8",
-        "mbfscrp": u"\U0001D4F9",
-        "mbfscrq": u"\U0001D4FA",
-        "mbfscrr": u"\U0001D4FB",
-        "mbfscrs": u"\U0001D4FC",
-        "mbfscrt": u"\U0001D4FD",
-        "mbfscru": u"\U0001D4FE",
-        "mbfscrv": u"\U0001D4FF",
-        "mbfscrw": u"\U0001D500",
-        "mbfscrx": u"\U0001D501",
-        "mbfscry": u"\U0001D502",
-        "mbfscrz": u"\U0001D503",
-        "mfrakA": u"\U0001D504",
-        "mfrakB": u"\U0001D505",
-        "mfrakD": u"\U0001D507",
-        "mfrakE": u"\U0001D508",
-        "mfrakF": u"\U0001D509",
-        "mfrakG": u"\U0001D50A",
-        "mfrakJ": u"\U0001D50D",
-        "mfrakK": u"\U0001D50E",
-        "mfrakL": u"\U0001D50F",
-        "mfrakM": u"\U0001D510",
-        "mfrakN": u"\U0001D511",
-        "mfrakO": u"\U0001D512",
-        "mfrakP": u"\U0001D513",
-        "mfrakQ": u"\U0001D514",
-        "mfrakS": u"\U0001D516",
-        "mfrakT": u"\U0001D517",
-        "mfrakU": u"\U0001D518",
-        "mfrakV": u"\U0001D519",
-        "mfrakW": u"\U0001D51A",
-        "mfrakX": u"\U0001D51B",
-        "mfrakY": u"\U0001D51C",
-        "mfraka": u"\U0001D51E",
-        "mfrakb": u"\U0001D51F",
-        "mfrakc": u"\U0001D520",
-        "mfrakd": u"\U0001D521",
-        "mfrake": u"\U0001D522",
-        "mfrakf": u"\U0001D523",
-        "mfrakg": u"\U0001D524",
-        "mfrakh": u"\U0001D525",
-        "mfraki": u"\U0001D526",
-        "mfrakj": u"\U0001D527",
-        "mfrakk": u"\U0001D528",
-        "mfrakl": u"\U0001D529",
-        "mfrakm": u"\U0001D52A",
-        "mfrakn": u"\U0001D52B",
-        "mfrako": u"\U0001D52C",
-        "mfrakp": u"\U0001D52D",
-        "mfrakq": u"\U0001D52E",
-        "mfrakr": u"\U0001D52F",
-        "mfraks": u"\U0001D530",
-        "mfrakt": u"\U0001D531",
-        "mfraku": u"\U0001D532",
-        "mfrakv": u"\U0001D533",
-        "mfrakw": u"\U0001D534",
-        "mfrakx": u"\U0001D535",
-        "mfraky": u"\U0001D536",
-        "mfrakz": u"\U0001D537",
-        "BbbA": u"\U0001D538",
-        "BbbB": u"\U0001D539",
-        "BbbD": u"\U0001D53B",
-        "BbbE": u"\U0001D53C",
-        "BbbF": u"\U0001D53D",
-        "BbbG": u"\U0001D53E",
-        "BbbI": u"\U0001D540",
-        "BbbJ": u"\U0001D541",
-        "BbbK": u"\U0001D542",
-        "BbbL": u"\U0001D543",
-        "BbbM": u"\U0001D544",
-        "BbbO": u"\U0001D546",
-        "BbbS": u"\U0001D54A",
-        "BbbT": u"\U0001D54B",
-        "BbbU": u"\U0001D54C",
-        "BbbV": u"\U0001D54D",
-        "BbbW": u"\U0001D54E",
-        "BbbX": u"\U0001D54F",
-        "BbbY": u"\U0001D550",
-        "Bbba": u"\U0001D552",
-        "Bbbb": u"\U0001D553",
-        "Bbbc": u"\U0001D554",
-        "Bbbd": u"\U0001D555",
-        "Bbbe": u"\U0001D556",
-        "Bbbf": u"\U0001D557",
-        "Bbbg": u"\U0001D558",
-        "Bbbh": u"\U0001D559",
-        "Bbbi": u"\U0001D55A",
-        "Bbbj": u"\U0001D55B",
-        "Bbbk": u"\U0001D55C",
-        "Bbbl": u"\U0001D55D",
-        "Bbbm": u"\U0001D55E",
-        "Bbbn": u"\U0001D55F",
-        "Bbbo": u"\U0001D560",
-        "Bbbp": u"\U0001D561",
-        "Bbbq": u"\U0001D562",
-        "Bbbr": u"\U0001D563",
-        "Bbbs": u"\U0001D564",
-        "Bbbt": u"\U0001D565",
-        "Bbbu": u"\U0001D566",
-        "Bbbv": u"\U0001D567",
-        "Bbbw": u"\U0001D568",
-        "Bbbx": u"\U0001D569",
-        "Bbby": u"\U0001D56A",
-        "Bbbz": u"\U0001D56B",
-        "mbffrakA": u"\U0001D56C",
-        "mbffrakB": u"\U0001D56D",
-        "mbffrakC": u"\U0001D56E",
-        "mbffrakD": u"\U0001D56F",
-        "mbffrakE": u"\U0001D570",
-        "mbffrakF": u"\U0001D571",
-        "mbffrakG": u"\U0001D572",
-        "mbffrakH": u"\U0001D573",
-        "mbffrakI": u"\U0001D574",
-        "mbffrakJ": u"\U0001D575",
-        "mbffrakK": u"\U0001D576",
-        "mbffrakL": u"\U0001D577",
-        "mbffrakM": u"\U0001D578",
-        "mbffrakN": u"\U0001D579",
-        "mbffrakO": u"\U0001D57A",
-        "mbffrakP": u"\U0001D57B",
-        "mbffrakQ": u"\U0001D57C",
-        "mbffrakR": u"\U0001D57D",
-        "mbffrakS": u"\U0001D57E",
-        "mbffrakT": u"\U0001D57F",
-        "mbffrakU": u"\U0001D580",
-        "mbffrakV": u"\U0001D581",
-        "mbffrakW": u"\U0001D582",
-        "mbffrakX": u"\U0001D583",
-        "mbffrakY": u"\U0001D584",
-        "mbffrakZ": u"\U0001D585",
-        "mbffraka": u"\U0001D586",
-        "mbffrakb": u"\U0001D587",
-        "mbffrakc": u"\U0001D588",
-        "mbffrakd": u"\U0001D589",
-        "mbffrake": u"\U0001D58A",
-        "mbffrakf": u"\U0001D58B",
-        "mbffrakg": u"\U0001D58C",
-        "mbffrakh": u"\U0001D58D",
-        "mbffraki": u"\U0001D58E",
-        "mbffrakj": u"\U0001D58F",
-        "mbffrakk": u"\U0001D590",
-        "mbffrakl": u"\U0001D591",
-        "mbffrakm": u"\U0001D592",
-        "mbffrakn": u"\U0001D593",
-        "mbffrako": u"\U0001D594",
-        "mbffrakp": u"\U0001D595",
-        "mbffrakq": u"\U0001D596",
-        "mbffrakr": u"\U0001D597",
-        "mbffraks": u"\U0001D598",
-        "mbffrakt": u"\U0001D599",
-        "mbffraku": u"\U0001D59A",
-        "mbffrakv": u"\U0001D59B",
-        "mbffrakw": u"\U0001D59C",
-        "mbffrakx": u"\U0001D59D",
-        "mbffraky": u"\U0001D59E",
-        "mbffrakz": u"\U0001D59F",
-        "msansA": u"\U0001D5A0",
-        "msansB": u"\U0001D5A1",
-        "msansC": u"\U0001D5A2",
-        "msansD": u"\U0001D5A3",
-        "msansE": u"\U0001D5A4",
-        "msansF": u"\U0001D5A5",
-        "msansG": u"\U0001D5A6",
-        "msansH": u"\U0001D5A7",
-        "msansI": u"\U0001D5A8",
-        "msansJ": u"\U0001D5A9",
-        "msansK": u"\U0001D5AA",
-        "msansL": u"\U0001D5AB",
-        "msansM": u"\U0001D5AC",
-        "msansN": u"\U0001D5AD",
-        "msansO": u"\U0001D5AE",
-        "msansP": u"\U0001D5AF",
-        "msansQ": u"\U0001D5B0",
-        "msansR": u"\U0001D5B1",
-        "msansS": u"\U0001D5B2",
-        "msansT": u"\U0001D5B3",
-        "msansU": u"\U0001D5B4",
-        "msansV": u"\U0001D5B5",
-        "msansW": u"\U0001D5B6",
-        "msansX": u"\U0001D5B7",
-        "msansY": u"\U0001D5B8",
-        "msansZ": u"\U0001D5B9",
-        "msansa": u"\U0001D5BA",
-        "msansb": u"\U0001D5BB",
-        "msansc": u"\U0001D5BC",
-        "msansd": u"\U0001D5BD",
-        "msanse": u"\U0001D5BE",
-        "msansf": u"\U0001D5BF",
-        "msansg": u"\U0001D5C0",
-        "msansh": u"\U0001D5C1",
-        "msansi": u"\U0001D5C2",
-        "msansj": u"\U0001D5C3",
-        "msansk": u"\U0001D5C4",
-        "msansl": u"\U0001D5C5",
-        "msansm": u"\U0001D5C6",
-        "msansn": u"\U0001D5C7",
-        "msanso": u"\U0001D5C8",
-        "msansp": u"\U0001D5C9",
-        "msansq": u"\U0001D5CA",
-        "msansr": u"\U0001D5CB",
-        "msanss": u"\U0001D5CC",
-        "msanst": u"\U0001D5CD",
-        "msansu": u"\U0001D5CE",
-        "msansv": u"\U0001D5CF",
-        "msansw": u"\U0001D5D0",
-        "msansx": u"\U0001D5D1",
-        "msansy": u"\U0001D5D2",
-        "msansz": u"\U0001D5D3",
-        "mbfsansA": u"\U0001D5D4",
-        "mbfsansB": u"\U0001D5D5",
-        "mbfsansC": u"\U0001D5D6",
-        "mbfsansD": u"\U0001D5D7",
-        "mbfsansE": u"\U0001D5D8",
-        "mbfsansF": u"\U0001D5D9",
-        "mbfsansG": u"\U0001D5DA",
-        "mbfsansH": u"\U0001D5DB",
-        "mbfsansI": u"\U0001D5DC",
-        "mbfsansJ": u"\U0001D5DD",
-        "mbfsansK": u"\U0001D5DE",
-        "mbfsansL": u"\U0001D5DF",
-        "mbfsansM": u"\U0001D5E0",
-        "mbfsansN": u"\U0001D5E1",
-        "mbfsansO": u"\U0001D5E2",
-        "mbfsansP": u"\U0001D5E3",
-        "mbfsansQ": u"\U0001D5E4",
-        "mbfsansR": u"\U0001D5E5",
-        "mbfsansS": u"\U0001D5E6",
-        "mbfsansT": u"\U0001D5E7",
-        "mbfsansU": u"\U0001D5E8",
-        "mbfsansV": u"\U0001D5E9",
-        "mbfsansW": u"\U0001D5EA",
-        "mbfsansX": u"\U0001D5EB",
-        "mbfsansY": u"\U0001D5EC",
-        "mbfsansZ": u"\U0001D5ED",
-        "mbfsansa": u"\U0001D5EE",
-        "mbfsansb": u"\U0001D5EF",
-        "mbfsansc": u"\U0001D5F0",
-        "mbfsansd": u"\U0001D5F1",
-        "mbfsanse": u"\U0001D5F2",
-        "mbfsansf": u"\U0001D5F3",
-        "mbfsansg": u"\U0001D5F4",
-        "mbfsansh": u"\U0001D5F5",
-        "mbfsansi": u"\U0001D5F6",
-        "mbfsansj": u"\U0001D5F7",
-        "mbfsansk": u"\U0001D5F8",
-        "mbfsansl": u"\U0001D5F9",
-        "mbfsansm": u"\U0001D5FA",
-        "mbfsansn": u"\U0001D5FB",
-        "mbfsanso": u"\U0001D5FC",
-        "mbfsansp": u"\U0001D5FD",
-        "mbfsansq": u"\U0001D5FE",
-        "mbfsansr": u"\U0001D5FF",
-        "mbfsanss": u"\U0001D600",
-        "mbfsanst": u"\U0001D601",
-        "mbfsansu": u"\U0001D602",
-        "mbfsansv": u"\U0001D603",
-        "mbfsansw": u"\U0001D604",
-        "mbfsansx": u"\U0001D605",
-        "mbfsansy": u"\U0001D606",
-        "mbfsansz": u"\U0001D607",
-        "mitsansA": u"\U0001D608",
-        "mitsansB": u"\U0001D609",
-        "mitsansC": u"\U0001D60A",
-        "mitsansD": u"\U0001D60B",
-        "mitsansE": u"\U0001D60C",
-        "mitsansF": u"\U0001D60D",
-        "mitsansG": u"\U0001D60E",
-        "mitsansH": u"\U0001D60F",
-        "mitsansI": u"\U0001D610",
-        "mitsansJ": u"\U0001D611",
-        "mitsansK": u"\U0001D612",
-        "mitsansL": u"\U0001D613",
-        "mitsansM": u"\U0001D614",
-        "mitsansN": u"\U0001D615",
-        "mitsansO": u"\U0001D616",
-        "mitsansP": u"\U0001D617",
-        "mitsansQ": u"\U0001D618",
-        "mitsansR": u"\U0001D619",
-        "mitsansS": u"\U0001D61A",
-        "mitsansT": u"\U0001D61B",
-        "mitsansU": u"\U0001D61C",
-        "mitsansV": u"\U0001D61D",
-        "mitsansW": u"\U0001D61E",
-        "mitsansX": u"\U0001D61F",
-        "mitsansY": u"\U0001D620",
-        "mitsansZ": u"\U0001D621",
-        "mitsansa": u"\U0001D622",
-        "mitsansb": u"\U0001D623",
-        "mitsansc": u"\U0001D624",
-        "mitsansd": u"\U0001D625",
-        "mitsanse": u"\U0001D626",
-        "mitsansf": u"\U0001D627",
-        "mitsansg": u"\U0001D628",
-        "mitsansh": u"\U0001D629",
-        "mitsansi": u"\U0001D62A",
-        "mitsansj": u"\U0001D62B",
-        "mitsansk": u"\U0001D62C",
-        "mitsansl": u"\U0001D62D",
-        "mitsansm": u"\U0001D62E",
-        "mitsansn": u"\U0001D62F",
-        "mitsanso": u"\U0001D630",
-        "mitsansp": u"\U0001D631",
-        "mitsansq": u"\U0001D632",
-        "mitsansr": u"\U0001D633",
-        "mitsanss": u"\U0001D634",
-        "mitsanst": u"\U0001D635",
-        "mitsansu": u"\U0001D636",
-        "mitsansv": u"\U0001D637",
-        "mitsansw": u"\U0001D638",
-        "mitsansx": u"\U0001D639",
-        "mitsansy": u"\U0001D63A",
-        "mitsansz": u"\U0001D63B",
-        "mbfitsansA": u"\U0001D63C",
-        "mbfitsansB": u"\U0001D63D",
-        "mbfitsansC": u"\U0001D63E",
-        "mbfitsansD": u"\U0001D63F",
-        "mbfitsansE": u"\U0001D640",
-        "mbfitsansF": u"\U0001D641",
-        "mbfitsansG": u"\U0001D642",
-        "mbfitsansH": u"\U0001D643",
-        "mbfitsansI": u"\U0001D644",
-        "mbfitsansJ": u"\U0001D645",
-        "mbfitsansK": u"\U0001D646",
-        "mbfitsansL": u"\U0001D647",
-        "mbfitsansM": u"\U0001D648",
-        "mbfitsansN": u"\U0001D649",
-        "mbfitsansO": u"\U0001D64A",
-        "mbfitsansP": u"\U0001D64B",
-        "mbfitsansQ": u"\U0001D64C",
-        "mbfitsansR": u"\U0001D64D",
-        "mbfitsansS": u"\U0001D64E",
-        "mbfitsansT": u"\U0001D64F",
-        "mbfitsansU": u"\U0001D650",
-        "mbfitsansV": u"\U0001D651",
-        "mbfitsansW": u"\U0001D652",
-        "mbfitsansX": u"\U0001D653",
-        "mbfitsansY": u"\U0001D654",
-        "mbfitsansZ": u"\U0001D655",
-        "mbfitsansa": u"\U0001D656",
-        "mbfitsansb": u"\U0001D657",
-        "mbfitsansc": u"\U0001D658",
-        "mbfitsansd": u"\U0001D659",
-        "mbfitsanse": u"\U0001D65A",
-        "mbfitsansf": u"\U0001D65B",
-        "mbfitsansg": u"\U0001D65C",
-        "mbfitsansh": u"\U0001D65D",
-        "mbfitsansi": u"\U0001D65E",
-        "mbfitsansj": u"\U0001D65F",
-        "mbfitsansk": u"\U0001D660",
-        "mbfitsansl": u"\U0001D661",
-        "mbfitsansm": u"\U0001D662",
-        "mbfitsansn": u"\U0001D663",
-        "mbfitsanso": u"\U0001D664",
-        "mbfitsansp": u"\U0001D665",
-        "mbfitsansq": u"\U0001D666",
-        "mbfitsansr": u"\U0001D667",
-        "mbfitsanss": u"\U0001D668",
-        "mbfitsanst": u"\U0001D669",
-        "mbfitsansu": u"\U0001D66A",
-        "mbfitsansv": u"\U0001D66B",
-        "mbfitsansw": u"\U0001D66C",
-        "mbfitsansx": u"\U0001D66D",
-        "mbfitsansy": u"\U0001D66E",
-        "mbfitsansz": u"\U0001D66F",
-        "mttA": u"\U0001D670",
-        "mttB": u"\U0001D671",
-        "mttC": u"\U0001D672",
-        "mttD": u"\U0001D673",
-        "mttE": u"\U0001D674",
-        "mttF": u"\U0001D675",
-        "mttG": u"\U0001D676",
-        "mttH": u"\U0001D677",
-        "mttI": u"\U0001D678",
-        "mttJ": u"\U0001D679",
-        "mttK": u"\U0001D67A",
-        "mttL": u"\U0001D67B",
-        "mttM": u"\U0001D67C",
-        "mttN": u"\U0001D67D",
-        "mttO": u"\U0001D67E",
-        "mttP": u"\U0001D67F",
-        "mttQ": u"\U0001D680",
-        "mttR": u"\U0001D681",
-        "mttS": u"\U0001D682",
-        "mttT": u"\U0001D683",
-        "mttU": u"\U0001D684",
-        "mttV": u"\U0001D685",
-        "mttW": u"\U0001D686",
-        "mttX": u"\U0001D687",
-        "mttY": u"\U0001D688",
-        "mttZ": u"\U0001D689",
-        "mtta": u"\U0001D68A",
-        "mttb": u"\U0001D68B",
-        "mttc": u"\U0001D68C",
-        "mttd": u"\U0001D68D",
-        "mtte": u"\U0001D68E",
-        "mttf": u"\U0001D68F",
-        "mttg": u"\U0001D690",
-        "mtth": u"\U0001D691",
-        "mtti": u"\U0001D692",
-        "mttj": u"\U0001D693",
-        "mttk": u"\U0001D694",
-        "mttl": u"\U0001D695",
-        "mttm": u"\U0001D696",
-        "mttn": u"\U0001D697",
-        "mtto": u"\U0001D698",
-        "mttp": u"\U0001D699",
-        "mttq": u"\U0001D69A",
-        "mttr": u"\U0001D69B",
-        "mtts": u"\U0001D69C",
-        "mttt": u"\U0001D69D",
-        "mttu": u"\U0001D69E",
-        "mttv": u"\U0001D69F",
-        "mttw": u"\U0001D6A0",
-        "mttx": u"\U0001D6A1",
-        "mtty": u"\U0001D6A2",
-        "mttz": u"\U0001D6A3",
         "imath": u"\U0001D6A4",
         "jmath": u"\U0001D6A5",
-        "mbfAlpha": u"\U0001D6A8",
-        "mbfBeta": u"\U0001D6A9",
-        "mbfGamma": u"\U0001D6AA",
-        "mbfDelta": u"\U0001D6AB",
-        "mbfEpsilon": u"\U0001D6AC",
-        "mbfZeta": u"\U0001D6AD",
-        "mbfEta": u"\U0001D6AE",
-        "mbfTheta": u"\U0001D6AF",
-        "mbfIota": u"\U0001D6B0",
-        "mbfKappa": u"\U0001D6B1",
-        "mbfLambda": u"\U0001D6B2",
-        "mbfMu": u"\U0001D6B3",
-        "mbfNu": u"\U0001D6B4",
-        "mbfXi": u"\U0001D6B5",
-        "mbfOmicron": u"\U0001D6B6",
-        "mbfPi": u"\U0001D6B7",
-        "mbfRho": u"\U0001D6B8",
-        "mbfvarTheta": u"\U0001D6B9",
-        "mbfSigma": u"\U0001D6BA",
-        "mbfTau": u"\U0001D6BB",
-        "mbfUpsilon": u"\U0001D6BC",
-        "mbfPhi": u"\U0001D6BD",
-        "mbfChi": u"\U0001D6BE",
-        "mbfPsi": u"\U0001D6BF",
-        "mbfOmega": u"\U0001D6C0",
-        "mbfnabla": u"\U0001D6C1",
-        "mbfalpha": u"\U0001D6C2",
-        "mbfbeta": u"\U0001D6C3",
-        "mbfgamma": u"\U0001D6C4",
-        "mbfdelta": u"\U0001D6C5",
-        "mbfepsilon": u"\U0001D6C6",
-        "mbfzeta": u"\U0001D6C7",
-        "mbfeta": u"\U0001D6C8",
-        "mbftheta": u"\U0001D6C9",
-        "mbfiota": u"\U0001D6CA",
-        "mbfkappa": u"\U0001D6CB",
-        "mbflambda": u"\U0001D6CC",
-        "mbfmu": u"\U0001D6CD",
-        "mbfnu": u"\U0001D6CE",
-        "mbfxi": u"\U0001D6CF",
-        "mbfomicron": u"\U0001D6D0",
-        "mbfpi": u"\U0001D6D1",
-        "mbfrho": u"\U0001D6D2",
-        "mbfvarsigma": u"\U0001D6D3",
-        "mbfsigma": u"\U0001D6D4",
-        "mbftau": u"\U0001D6D5",
-        "mbfupsilon": u"\U0001D6D6",
-        "mbfvarphi": u"\U0001D6D7",
-        "mbfchi": u"\U0001D6D8",
-        "mbfpsi": u"\U0001D6D9",
-        "mbfomega": u"\U0001D6DA",
-        "mbfpartial": u"\U0001D6DB",
-        "mbfvarepsilon": u"\U0001D6DC",
-        "mbfvartheta": u"\U0001D6DD",
-        "mbfvarkappa": u"\U0001D6DE",
-        "mbfphi": u"\U0001D6DF",
-        "mbfvarrho": u"\U0001D6E0",
-        "mbfvarpi": u"\U0001D6E1",
-        "mitAlpha": u"\U0001D6E2",
-        "mitBeta": u"\U0001D6E3",
-        "mitGamma": u"\U0001D6E4",
-        "mitDelta": u"\U0001D6E5",
-        "mitEpsilon": u"\U0001D6E6",
-        "mitZeta": u"\U0001D6E7",
-        "mitEta": u"\U0001D6E8",
-        "mitTheta": u"\U0001D6E9",
-        "mitIota": u"\U0001D6EA",
-        "mitKappa": u"\U0001D6EB",
-        "mitLambda": u"\U0001D6EC",
-        "mitMu": u"\U0001D6ED",
-        "mitNu": u"\U0001D6EE",
-        "mitXi": u"\U0001D6EF",
-        "mitOmicron": u"\U0001D6F0",
-        "mitPi": u"\U0001D6F1",
-        "mitRho": u"\U0001D6F2",
-        "mitvarTheta": u"\U0001D6F3",
-        "mitSigma": u"\U0001D6F4",
-        "mitTau": u"\U0001D6F5",
-        "mitUpsilon": u"\U0001D6F6",
-        "mitPhi": u"\U0001D6F7",
-        "mitChi": u"\U0001D6F8",
-        "mitPsi": u"\U0001D6F9",
-        "mitOmega": u"\U0001D6FA",
-        "mitnabla": u"\U0001D6FB",
-        "mitalpha": u"\U0001D6FC",
-        "mitbeta": u"\U0001D6FD",
-        "mitgamma": u"\U0001D6FE",
-        "mitdelta": u"\U0001D6FF",
-        "mitepsilon": u"\U0001D700",
-        "mitzeta": u"\U0001D701",
-        "miteta": u"\U0001D702",
-        "mittheta": u"\U0001D703",
-        "mitiota": u"\U0001D704",
-        "mitkappa": u"\U0001D705",
-        "mitlambda": u"\U0001D706",
-        "mitmu": u"\U0001D707",
-        "mitnu": u"\U0001D708",
-        "mitxi": u"\U0001D709",
-        "mitomicron": u"\U0001D70A",
-        "mitpi": u"\U0001D70B",
-        "mitrho": u"\U0001D70C",
-        "mitvarsigma": u"\U0001D70D",
-        "mitsigma": u"\U0001D70E",
-        "mittau": u"\U0001D70F",
-        "mitupsilon": u"\U0001D710",
-        "mitphi": u"\U0001D711",
-        "mitchi": u"\U0001D712",
-        "mitpsi": u"\U0001D713",
-        "mitomega": u"\U0001D714",
-        "mitpartial": u"\U0001D715",
-        "mitvarepsilon": u"\U0001D716",
-        "mitvartheta": u"\U0001D717",
-        "mitvarkappa": u"\U0001D718",
-        "mitvarphi": u"\U0001D719",
-        "mitvarrho": u"\U0001D71A",
-        "mitvarpi": u"\U0001D71B",
-        "mbfitAlpha": u"\U0001D71C",
-        "mbfitBeta": u"\U0001D71D",
-        "mbfitGamma": u"\U0001D71E",
-        "mbfitDelta": u"\U0001D71F",
-        "mbfitEpsilon": u"\U0001D720",
-        "mbfitZeta": u"\U0001D721",
-        "mbfitEta": u"\U0001D722",
-        "mbfitTheta": u"\U0001D723",
-        "mbfitIota": u"\U0001D724",
-        "mbfitKappa": u"\U0001D725",
-        "mbfitLambda": u"\U0001D726",
-        "mbfitMu": u"\U0001D727",
-        "mbfitNu": u"\U0001D728",
-        "mbfitXi": u"\U0001D729",
-        "mbfitOmicron": u"\U0001D72A",
-        "mbfitPi": u"\U0001D72B",
-        "mbfitRho": u"\U0001D72C",
-        "mbfitvarTheta": u"\U0001D72D",
-        "mbfitSigma": u"\U0001D72E",
-        "mbfitTau": u"\U0001D72F",
-        "mbfitUpsilon": u"\U0001D730",
-        "mbfitPhi": u"\U0001D731",
-        "mbfitChi": u"\U0001D732",
-        "mbfitPsi": u"\U0001D733",
-        "mbfitOmega": u"\U0001D734",
-        "mbfitnabla": u"\U0001D735",
-        "mbfitalpha": u"\U0001D736",
-        "mbfitbeta": u"\U0001D737",
-        "mbfitgamma": u"\U0001D738",
-        "mbfitdelta": u"\U0001D739",
-        "mbfitepsilon": u"\U0001D73A",
-        "mbfitzeta": u"\U0001D73B",
-        "mbfiteta": u"\U0001D73C",
-        "mbfittheta": u"\U0001D73D",
-        "mbfitiota": u"\U0001D73E",
-        "mbfitkappa": u"\U0001D73F",
-        "mbfitlambda": u"\U0001D740",
-        "mbfitmu": u"\U0001D741",
-        "mbfitnu": u"\U0001D742",
-        "mbfitxi": u"\U0001D743",
-        "mbfitomicron": u"\U0001D744",
-        "mbfitpi": u"\U0001D745",
-        "mbfitrho": u"\U0001D746",
-        "mbfitvarsigma": u"\U0001D747",
-        "mbfitsigma": u"\U0001D748",
-        "mbfittau": u"\U0001D749",
-        "mbfitupsilon": u"\U0001D74A",
-        "mbfitphi": u"\U0001D74B",
-        "mbfitchi": u"\U0001D74C",
-        "mbfitpsi": u"\U0001D74D",
-        "mbfitomega": u"\U0001D74E",
-        "mbfitpartial": u"\U0001D74F",
-        "mbfitvarepsilon": u"\U0001D750",
-        "mbfitvartheta": u"\U0001D751",
-        "mbfitvarkappa": u"\U0001D752",
-        "mbfitvarphi": u"\U0001D753",
-        "mbfitvarrho": u"\U0001D754",
-        "mbfitvarpi": u"\U0001D755",
-        "mbfsansAlpha": u"\U0001D756",
-        "mbfsansBeta": u"\U0001D757",
-        "mbfsansGamma": u"\U0001D758",
-        "mbfsansDelta": u"\U0001D759",
-        "mbfsansEpsilon": u"\U0001D75A",
-        "mbfsansZeta": u"\U0001D75B",
-        "mbfsansEta": u"\U0001D75C",
-        "mbfsansTheta": u"\U0001D75D",
-        "mbfsansIota": u"\U0001D75E",
-        "mbfsansKappa": u"\U0001D75F",
-        "mbfsansLambda": u"\U0001D760",
-        "mbfsansMu": u"\U0001D761",
-        "mbfsansNu": u"\U0001D762",
-        "mbfsansXi": u"\U0001D763",
-        "mbfsansOmicron": u"\U0001D764",
-        "mbfsansPi": u"\U0001D765",
-        "mbfsansRho": u"\U0001D766",
-        "mbfsansvarTheta": u"\U0001D767",
-        "mbfsansSigma": u"\U0001D768",
-        "mbfsansTau": u"\U0001D769",
-        "mbfsansUpsilon": u"\U0001D76A",
-        "mbfsansPhi": u"\U0001D76B",
-        "mbfsansChi": u"\U0001D76C",
-        "mbfsansPsi": u"\U0001D76D",
-        "mbfsansOmega": u"\U0001D76E",
-        "mbfsansnabla": u"\U0001D76F",
-        "mbfsansalpha": u"\U0001D770",
-        "mbfsansbeta": u"\U0001D771",
-        "mbfsansgamma": u"\U0001D772",
-        "mbfsansdelta": u"\U0001D773",
-        "mbfsansepsilon": u"\U0001D774",
-        "mbfsanszeta": u"\U0001D775",
-        "mbfsanseta": u"\U0001D776",
-        "mbfsanstheta": u"\U0001D777",
-        "mbfsansiota": u"\U0001D778",
-        "mbfsanskappa": u"\U0001D779",
-        "mbfsanslambda": u"\U0001D77A",
-        "mbfsansmu": u"\U0001D77B",
-        "mbfsansnu": u"\U0001D77C",
-        "mbfsansxi": u"\U0001D77D",
-        "mbfsansomicron": u"\U0001D77E",
-        "mbfsanspi": u"\U0001D77F",
-        "mbfsansrho": u"\U0001D780",
-        "mbfsansvarsigma": u"\U0001D781",
-        "mbfsanssigma": u"\U0001D782",
-        "mbfsanstau": u"\U0001D783",
-        "mbfsansupsilon": u"\U0001D784",
-        "mbfsansphi": u"\U0001D785",
-        "mbfsanschi": u"\U0001D786",
-        "mbfsanspsi": u"\U0001D787",
-        "mbfsansomega": u"\U0001D788",
-        "mbfsanspartial": u"\U0001D789",
-        "mbfsansvarepsilon": u"\U0001D78A",
-        "mbfsansvartheta": u"\U0001D78B",
-        "mbfsansvarkappa": u"\U0001D78C",
-        "mbfsansvarphi": u"\U0001D78D",
-        "mbfsansvarrho": u"\U0001D78E",
-        "mbfsansvarpi": u"\U0001D78F",
-        "mbfitsansAlpha": u"\U0001D790",
-        "mbfitsansBeta": u"\U0001D791",
-        "mbfitsansGamma": u"\U0001D792",
-        "mbfitsansDelta": u"\U0001D793",
-        "mbfitsansEpsilon": u"\U0001D794",
-        "mbfitsansZeta": u"\U0001D795",
-        "mbfitsansEta": u"\U0001D796",
-        "mbfitsansTheta": u"\U0001D797",
-        "mbfitsansIota": u"\U0001D798",
-        "mbfitsansKappa": u"\U0001D799",
-        "mbfitsansLambda": u"\U0001D79A",
-        "mbfitsansMu": u"\U0001D79B",
-        "mbfitsansNu": u"\U0001D79C",
-        "mbfitsansXi": u"\U0001D79D",
-        "mbfitsansOmicron": u"\U0001D79E",
-        "mbfitsansPi": u"\U0001D79F",
-        "mbfitsansRho": u"\U0001D7A0",
-        "mbfitsansvarTheta": u"\U0001D7A1",
-        "mbfitsansSigma": u"\U0001D7A2",
-        "mbfitsansTau": u"\U0001D7A3",
-        "mbfitsansUpsilon": u"\U0001D7A4",
-        "mbfitsansPhi": u"\U0001D7A5",
-        "mbfitsansChi": u"\U0001D7A6",
-        "mbfitsansPsi": u"\U0001D7A7",
-        "mbfitsansOmega": u"\U0001D7A8",
-        "mbfitsansnabla": u"\U0001D7A9",
-        "mbfitsansalpha": u"\U0001D7AA",
-        "mbfitsansbeta": u"\U0001D7AB",
-        "mbfitsansgamma": u"\U0001D7AC",
-        "mbfitsansdelta": u"\U0001D7AD",
-        "mbfitsansepsilon": u"\U0001D7AE",
-        "mbfitsanszeta": u"\U0001D7AF",
-        "mbfitsanseta": u"\U0001D7B0",
-        "mbfitsanstheta": u"\U0001D7B1",
-        "mbfitsansiota": u"\U0001D7B2",
-        "mbfitsanskappa": u"\U0001D7B3",
-        "mbfitsanslambda": u"\U0001D7B4",
-        "mbfitsansmu": u"\U0001D7B5",
-        "mbfitsansnu": u"\U0001D7B6",
-        "mbfitsansxi": u"\U0001D7B7",
-        "mbfitsansomicron": u"\U0001D7B8",
-        "mbfitsanspi": u"\U0001D7B9",
-        "mbfitsansrho": u"\U0001D7BA",
-        "mbfitsansvarsigma": u"\U0001D7BB",
-        "mbfitsanssigma": u"\U0001D7BC",
-        "mbfitsanstau": u"\U0001D7BD",
-        "mbfitsansupsilon": u"\U0001D7BE",
-        "mbfitsansphi": u"\U0001D7BF",
-        "mbfitsanschi": u"\U0001D7C0",
-        "mbfitsanspsi": u"\U0001D7C1",
-        "mbfitsansomega": u"\U0001D7C2",
-        "mbfitsanspartial": u"\U0001D7C3",
-        "mbfitsansvarepsilon": u"\U0001D7C4",
-        "mbfitsansvartheta": u"\U0001D7C5",
-        "mbfitsansvarkappa": u"\U0001D7C6",
-        "mbfitsansvarphi": u"\U0001D7C7",
-        "mbfitsansvarrho": u"\U0001D7C8",
-        "mbfitsansvarpi": u"\U0001D7C9",
-        "mbfDigamma": u"\U0001D7CA",
-        "mbfdigamma": u"\U0001D7CB",
-        "mbfzero": u"\U0001D7CE",
-        "mbfone": u"\U0001D7CF",
-        "mbftwo": u"\U0001D7D0",
-        "mbfthree": u"\U0001D7D1",
-        "mbffour": u"\U0001D7D2",
-        "mbffive": u"\U0001D7D3",
-        "mbfsix": u"\U0001D7D4",
-        "mbfseven": u"\U0001D7D5",
-        "mbfeight": u"\U0001D7D6",
-        "mbfnine": u"\U0001D7D7",
-        "Bbbzero": u"\U0001D7D8",
-        "Bbbone": u"\U0001D7D9",
-        "Bbbtwo": u"\U0001D7DA",
-        "Bbbthree": u"\U0001D7DB",
-        "Bbbfour": u"\U0001D7DC",
-        "Bbbfive": u"\U0001D7DD",
-        "Bbbsix": u"\U0001D7DE",
-        "Bbbseven": u"\U0001D7DF",
-        "Bbbeight": u"\U0001D7E0",
-        "Bbbnine": u"\U0001D7E1",
-        "msanszero": u"\U0001D7E2",
-        "msansone": u"\U0001D7E3",
-        "msanstwo": u"\U0001D7E4",
-        "msansthree": u"\U0001D7E5",
-        "msansfour": u"\U0001D7E6",
-        "msansfive": u"\U0001D7E7",
-        "msanssix": u"\U0001D7E8",
-        "msansseven": u"\U0001D7E9",
-        "msanseight": u"\U0001D7EA",
-        "msansnine": u"\U0001D7EB",
-        "mbfsanszero": u"\U0001D7EC",
-        "mbfsansone": u"\U0001D7ED",
-        "mbfsanstwo": u"\U0001D7EE",
-        "mbfsansthree": u"\U0001D7EF",
-        "mbfsansfour": u"\U0001D7F0",
-        "mbfsansfive": u"\U0001D7F1",
-        "mbfsanssix": u"\U0001D7F2",
-        "mbfsansseven": u"\U0001D7F3",
-        "mbfsanseight": u"\U0001D7F4",
-        "mbfsansnine": u"\U0001D7F5",
-        "mttzero": u"\U0001D7F6",
-        "mttone": u"\U0001D7F7",
-        "mtttwo": u"\U0001D7F8",
-        "mttthree": u"\U0001D7F9",
-        "mttfour": u"\U0001D7FA",
-        "mttfive": u"\U0001D7FB",
-        "mttsix": u"\U0001D7FC",
-        "mttseven": u"\U0001D7FD",
-        "mtteight": u"\U0001D7FE",
-        "mttnine": u"\U0001D7FF",
-
-        # Emoji
+
+        "^0": u"\u2070",
+        "^1": u"\u00B9",
+        "^2": u"\u00B2",
+        "^3": u"\u00B3",
+        "^4": u"\u2074",
+        "^5": u"\u2075",
+        "^6": u"\u2076",
+        "^7": u"\u2077",
+        "^8": u"\u2078",
+        "^9": u"\u2079",
+        "^+": u"\u207A",
+        "^-": u"\u207B",
+        "^=": u"\u207C",
+        "^(": u"\u207D",
+        "^)": u"\u207E",
+
+        "^a": u"\u1D43",
+        "^b": u"\u1D47",
+        "^c": u"\u1D9C",
+        "^d": u"\u1D48",
+        "^e": u"\u1D49",
+        "^f": u"\u1DA0",
+        "^g": u"\u1D4D",
+        "^h": u"\u02B0",
+        "^i": u"\u2071",
+        "^j": u"\u02B2",
+        "^k": u"\u1D4F",
+        "^l": u"\u02E1",
+        "^m": u"\u1D50",
+        "^n": u"\u207F",
+        "^o": u"\u1D52",
+        "^p": u"\u1D56",
+        "^r": u"\u02B3",
+        "^s": u"\u02E2",
+        "^t": u"\u1D57",
+        "^u": u"\u1D58",
+        "^v": u"\u1D5B",
+        "^w": u"\u02B7",
+        "^x": u"\u02E3",
+        "^y": u"\u02B8",
+        "^z": u"\u1DBB",
+
+        "^A": u"\u1D2C",
+        "^B": u"\u1D2E",
+        "^D": u"\u1D30",
+        "^E": u"\u1D31",
+        "^G": u"\u1D33",
+        "^H": u"\u1D34",
+        "^I": u"\u1D35",
+        "^J": u"\u1D36",
+        "^K": u"\u1D37",
+        "^L": u"\u1D38",
+        "^M": u"\u1D39",
+        "^N": u"\u1D3A",
+        "^O": u"\u1D3C",
+        "^P": u"\u1D3E",
+        "^R": u"\u1D3F",
+        "^T": u"\u1D40",
+        "^U": u"\u1D41",
+        "^V": u"\u2C7D",
+        "^W": u"\u1D42",
+
+        "_0": u"\u2080",
+        "_1": u"\u2081",
+        "_2": u"\u2082",
+        "_3": u"\u2083",
+        "_4": u"\u2084",
+        "_5": u"\u2085",
+        "_6": u"\u2086",
+        "_7": u"\u2087",
+        "_8": u"\u2088",
+        "_9": u"\u2089",
+        "_+": u"\u208A",
+        "_-": u"\u208B",
+        "_=": u"\u208C",
+        "_(": u"\u208D",
+        "_)": u"\u208E",
+
+        "_a": u"\u2090",
+        "_e": u"\u2091",
+        "_h": u"\u2095",
+        "_i": u"\u1D62",
+        "_j": u"\u2C7C",
+        "_k": u"\u2096",
+        "_l": u"\u2097",
+        "_m": u"\u2098",
+        "_n": u"\u2099",
+        "_o": u"\u2092",
+        "_p": u"\u209A",
+        "_r": u"\u1D63",
+        "_s": u"\u209B",
+        "_t": u"\u209C",
+        "_u": u"\u1D64",
+        "_v": u"\u1D65",
+        "_x": u"\u2093",
+
+        "_schwa": u"\u2094",
+
+        "--": u"\u2014",
+
+        "check": u"\u2713",
+        "Check": u"\u2714",
+        "ballotx": u"\u2717",
+        "Ballotx": u"\u2718",
+
+        "neq": u"\u2260",
+        "degree": u"\u00B0",
+
+        # Some interesting symbol sets from unicode-table.com
+        "libra": u"\u264E",
+        "blacksun": u"\u2600",
+        "umbrella": u"\u2602",
+        "blackchessknight": u"\u265E",
+        "yinyang": u"\u262F",
+        "hammersickle": u"\u262D",
+        "radioactive": u"\u2622",
+        "telephone": u"\u260E",
+        "snowflake": u"\u2744",
+        "scissors": u"\u2702",
+
+        "aries": u"\u2648",
+        "taurus": u"\u2649",
+        "gemini": u"\u264A",
+        "cancer": u"\u264B",
+        "leo": u"\u264C",
+        "virgo": u"\u264D",
+        "libra": u"\u264E",
+        "scorpius": u"\u264F",
+        "sagittarius": u"\u2650",
+        "capricorn": u"\u2651",
+        "aquarius": u"\u2652",
+        "pisces": u"\u2653",
+
+        "trademark": u"\u2122",
+
+        # Happy new year 2014
+        "fir": u"\U0001F384",
+
+        "Box": u"\u2610",
+        "Hbar": u"\u0126",
+        "hbar": u"\u0127",
+        "eth": u"\u00f0",
+
+        "fraction_1_2": u"\u00bd",
+        "fraction_1_4": u"\u00bc",
+        "fraction_3_4": u"\u00be",
+        "fraction_1_7": u"\u2150",
+        "fraction_1_9": u"\u2151",
+        "fraction_1_10": u"\u2152",
+        "fraction_1_3": u"\u2153",
+        "fraction_2_3": u"\u2154",
+        "fraction_1_5": u"\u2155",
+        "fraction_2_5": u"\u2156",
+        "fraction_3_5": u"\u2157",
+        "fraction_4_5": u"\u2158",
+        "fraction_1_6": u"\u2159",
+        "fraction_5_6": u"\u215a",
+        "fraction_1_8": u"\u215b",
+        "fraction_3_8": u"\u215c",
+        "fraction_5_8": u"\u215d",
+        "fraction_7_8": u"\u215e",
+        "fraction_1_": u"\u215f"
+    }
+    result.update(make_alphabets())
+    return result
+
+# Math alphabets: letters of each style are runs of Mathematical Alphanumeric Symbols
+# block in the same order, so they are computed from code points instead of being listed
+# Letters, that were encoded before the block, are listed in exceptions, None marks holes
+ALPHABET_LATIN = u'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+ALPHABET_GREEK = (
+    'Alpha', 'Beta', 'Gamma', 'Delta', 'Epsilon', 'Zeta', 'Eta', 'Theta', 'Iota', 'Kappa',
+    'Lambda', 'Mu', 'Nu', 'Xi', 'Omicron', 'Pi', 'Rho', 'varTheta', 'Sigma', 'Tau', 'Upsilon',
+    'Phi', 'Chi', 'Psi', 'Omega', 'nabla',
+    'alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'eta', 'theta', 'iota', 'kappa',
+    'lambda', 'mu', 'nu', 'xi', 'omicron', 'pi', 'rho', 'varsigma', 'sigma', 'tau', 'upsilon',
+    'phi', 'chi', 'psi', 'omega', 'partial',
+    'varepsilon', 'vartheta', 'varkappa', 'varphi', 'varrho', 'varpi')
+ALPHABET_DIGITS = ('zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine')
+
+# Style -> first code points of latin letters, greek letters and digits, None if style has no such letters
+ALPHABET_STYLES = {
+    'mbf': (0x1D400, 0x1D6A8, 0x1D7CE),
+    'mit': (0x1D434, 0x1D6E2, None),
+    'mbfit': (0x1D468, 0x1D71C, None),
+    'mscr': (0x1D49C, None, None),
+    'mbfscr': (0x1D4D0, None, None),
+    'mfrak': (0x1D504, None, None),
+    'Bbb': (0x1D538, None, 0x1D7D8),
+    'mbffrak': (0x1D56C, None, None),
+    'msans': (0x1D5A0, None, 0x1D7E2),
+    'mbfsans': (0x1D5D4, 0x1D756, 0x1D7EC),
+    'mitsans': (0x1D608, None, None),
+    'mbfitsans': (0x1D63C, 0x1D790, None),
+    'mtt': (0x1D670, None, 0x1D7F6),
+    'mitBbb': (None, None, None),
+}
+
+ALPHABET_EXCEPTIONS = {
+    "mbfvarphi": u"\U0001D6D7",
+    "mbfphi": u"\U0001D6DF",
+    "mbfDigamma": u"\U0001D7CA",
+    "mbfdigamma": u"\U0001D7CB",
+    "mith": None,
+    "mscrB": u"\U0000212C",
+    "mscrE": u"\U00002130",
+    "mscrF": u"\U00002131",
+    "mscrH": u"\U0000210B",
+    "mscrI": u"\U00002110",
+    "mscrL": u"\U00002112",
+    "mscrM": u"\U00002133",
+    "mscrR": u"\U0000211B",
+    "mscre": u"\U0000212F",
+    "mscrg": u"\U0000210A",
+    "mscro": u"\U00002134",
+    "mfrakC": u"\U0000212D",
+    "mfrakH": u"\U0000210C",
+    "mfrakI": None,
+    "mfrakR": None,
+    "mfrakZ": u"\U00002128",
+    "BbbC": u"\U00002102",
+    "BbbH": u"\U0000210D",
+    "BbbN": u"\U00002115",
+    "BbbP": u"\U00002119",
+    "BbbQ": u"\U0000211A",
+    "BbbR": u"\U0000211D",
+    "BbbZ": u"\U00002124",
+    "Bbbgamma": u"\U0000213D",
+    "Bbbpi": u"\U0000213C",
+    "BbbGamma": u"\U0000213E",
+    "BbbPi": u"\U0000213F",
+    "Bbbsum": u"\U00002140",
+    "mitBbbD": u"\U00002145",
+    "mitBbbd": u"\U00002146",
+    "mitBbbe": u"\U00002147",
+    "mitBbbi": u"\U00002148",
+    "mitBbbj": u"\U00002149",
+}
+
+# Letterlike symbols filling holes, that have other names (Planckconst, Im, Re)
+ALPHABET_HOLES = {
+    "mith": u"\U0000210E",
+    "mfrakI": u"\U00002111",
+    "mfrakR": u"\U0000211C",
+}
+
+ALPHABET_INDEX = dict(chain(
+    ((letter, (0, i)) for i, letter in enumerate(ALPHABET_LATIN)),
+    ((letter, (1, i)) for i, letter in enumerate(ALPHABET_GREEK)),
+    ((letter, (2, i)) for i, letter in enumerate(ALPHABET_DIGITS))))
+
+ALPHABET_RE = re.compile('|'.join(sorted(ALPHABET_STYLES, key=len, reverse=True)))
+
+
+def alphabet_symbol(style, letter):
+    """
+    Returns letter in math alphabet style, None if style has no such letter
+    """
+    name = style + letter
+    if name in ALPHABET_EXCEPTIONS:
+        return ALPHABET_EXCEPTIONS[name]
+    if style not in ALPHABET_STYLES or letter not in ALPHABET_INDEX:
+        return None
+    run, i = ALPHABET_INDEX[letter]
+    first = ALPHABET_STYLES[style][run]
+    return None if first is None else uchr(first + i)
+
+
+def make_alphabets():
+    result = {}
+    for style in ALPHABET_STYLES:
+        for letters in (ALPHABET_LATIN, ALPHABET_GREEK, ALPHABET_DIGITS):
+            for letter in letters:
+                symbol = alphabet_symbol(style, letter)
+                if symbol is not None:
+                    result[style + letter] = symbol
+    for name, symbol in ALPHABET_EXCEPTIONS.items():
+        if symbol is not None:
+            result[name] = symbol
+    return result
+
+
+# Styles in order they are offered to user with their descriptions
+ALPHABET_STYLE_NAMES = (
+    ('mbf', 'bold'),
+    ('mit', 'italic'),
+    ('mbfit', 'bold italic'),
+    ('mscr', 'script'),
+    ('mbfscr', 'bold script'),
+    ('mfrak', 'fraktur'),
+    ('mbffrak', 'bold fraktur'),
+    ('Bbb', 'double-struck'),
+    ('mitBbb', 'double-struck italic'),
+    ('msans', 'sans-serif'),
+    ('mbfsans', 'sans-serif bold'),
+    ('mitsans', 'sans-serif italic'),
+    ('mbfitsans', 'sans-serif bold italic'),
+    ('mtt', 'monospace'),
+)
+
+_stylize_tables = {}
+
+
+def stylize_table(style):
+    """
+    Returns table for str.translate, which maps latin and greek letters and digits to
+    ones of math alphabet style; chars without styled form are missing
+    Greek letters and digits are mapped by position in their runs, as in Unicode
+    """
+    if style not in ALPHABET_STYLES:
+        raise ValueError('Unknown math alphabet style: {0}'.format(style))
+    if style not in _stylize_tables:
+        greek = u''.join(uchr(c) for c in chain(
+            range(0x391, 0x3A2), [0x3F4], range(0x3A3, 0x3AA), [0x2207],
+            range(0x3B1, 0x3CA), [0x2202, 0x3F5, 0x3D1, 0x3F0, 0x3D5, 0x3F1, 0x3D6]))
+        _, greek_first, digits_first = ALPHABET_STYLES[style]
+        table = {}
+        for ch in ALPHABET_LATIN:
+            rep = ALPHABET_HOLES.get(style + ch) or alphabet_symbol(style, ch)
+            if rep is not None:
+                table[ord(ch)] = rep
+        for chars, first in ((greek, greek_first), (u'0123456789', digits_first)):
+            if first is not None:
+                for i, ch in enumerate(chars):
+                    table[ord(ch)] = uchr(first + i)
+        _stylize_tables[style] = table
+    return _stylize_tables[style]
+
+
+def stylize(text, style):
+    """
+    Converts letters and digits of text to math alphabet style in one pass, other
+    chars are left as is
+    """
+    return text.translate(stylize_table(style))
+
+
+# Emoji are loaded only when needed, see require_names
+def make_emoji():
+    result = {
         ":grinning-face": u"\U0001F600",
         ":grinning-face-with-smiling-eyes": u"\U0001F601",
         ":face-with-tears-of-joy": u"\U0001F602",
@@ -4559,210 +3886,47 @@ def make_maths():
         ":region:za": u"\U0001F1FF\U0001F1E6",
         ":region:zm": u"\U0001F1FF\U0001F1F2",
         ":region:zw": u"\U0001F1FF\U0001F1FC",
+    }
+    return result
 
-        "^0": u"\u2070",
-        "^1": u"\u00B9",
-        "^2": u"\u00B2",
-        "^3": u"\u00B3",
-        "^4": u"\u2074",
-        "^5": u"\u2075",
-        "^6": u"\u2076",
-        "^7": u"\u2077",
-        "^8": u"\u2078",
-        "^9": u"\u2079",
-        "^+": u"\u207A",
-        "^-": u"\u207B",
-        "^=": u"\u207C",
-        "^(": u"\u207D",
-        "^)": u"\u207E",
-
-        "^a": u"\u1D43",
-        "^b": u"\u1D47",
-        "^c": u"\u1D9C",
-        "^d": u"\u1D48",
-        "^e": u"\u1D49",
-        "^f": u"\u1DA0",
-        "^g": u"\u1D4D",
-        "^h": u"\u02B0",
-        "^i": u"\u2071",
-        "^j": u"\u02B2",
-        "^k": u"\u1D4F",
-        "^l": u"\u02E1",
-        "^m": u"\u1D50",
-        "^n": u"\u207F",
-        "^o": u"\u1D52",
-        "^p": u"\u1D56",
-        "^r": u"\u02B3",
-        "^s": u"\u02E2",
-        "^t": u"\u1D57",
-        "^u": u"\u1D58",
-        "^v": u"\u1D5B",
-        "^w": u"\u02B7",
-        "^x": u"\u02E3",
-        "^y": u"\u02B8",
-        "^z": u"\u1DBB",
-
-        "^A": u"\u1D2C",
-        "^B": u"\u1D2E",
-        "^D": u"\u1D30",
-        "^E": u"\u1D31",
-        "^G": u"\u1D33",
-        "^H": u"\u1D34",
-        "^I": u"\u1D35",
-        "^J": u"\u1D36",
-        "^K": u"\u1D37",
-        "^L": u"\u1D38",
-        "^M": u"\u1D39",
-        "^N": u"\u1D3A",
-        "^O": u"\u1D3C",
-        "^P": u"\u1D3E",
-        "^R": u"\u1D3F",
-        "^T": u"\u1D40",
-        "^U": u"\u1D41",
-        "^V": u"\u2C7D",
-        "^W": u"\u1D42",
-
-        "_0": u"\u2080",
-        "_1": u"\u2081",
-        "_2": u"\u2082",
-        "_3": u"\u2083",
-        "_4": u"\u2084",
-        "_5": u"\u2085",
-        "_6": u"\u2086",
-        "_7": u"\u2087",
-        "_8": u"\u2088",
-        "_9": u"\u2089",
-        "_+": u"\u208A",
-        "_-": u"\u208B",
-        "_=": u"\u208C",
-        "_(": u"\u208D",
-        "_)": u"\u208E",
-
-        "_a": u"\u2090",
-        "_e": u"\u2091",
-        "_h": u"\u2095",
-        "_i": u"\u1D62",
-        "_j": u"\u2C7C",
-        "_k": u"\u2096",
-        "_l": u"\u2097",
-        "_m": u"\u2098",
-        "_n": u"\u2099",
-        "_o": u"\u2092",
-        "_p": u"\u209A",
-        "_r": u"\u1D63",
-        "_s": u"\u209B",
-        "_t": u"\u209C",
-        "_u": u"\u1D64",
-        "_v": u"\u1D65",
-        "_x": u"\u2093",
-
-        "_schwa": u"\u2094",
-
-        "--": u"\u2014",
-
-        "check": u"\u2713",
-        "Check": u"\u2714",
-        "ballotx": u"\u2717",
-        "Ballotx": u"\u2718",
-
-        "neq": u"\u2260",
-        "degree": u"\u00B0",
-
-        # Some interesting symbol sets from unicode-table.com
-        "libra": u"\u264E",
-        "blacksun": u"\u2600",
-        "umbrella": u"\u2602",
-        "blackchessknight": u"\u265E",
-        "yinyang": u"\u262F",
-        "hammersickle": u"\u262D",
-        "radioactive": u"\u2622",
-        "telephone": u"\u260E",
-        "snowflake": u"\u2744",
-        "scissors": u"\u2702",
-
-        "aries": u"\u2648",
-        "taurus": u"\u2649",
-        "gemini": u"\u264A",
-        "cancer": u"\u264B",
-        "leo": u"\u264C",
-        "virgo": u"\u264D",
-        "libra": u"\u264E",
-        "scorpius": u"\u264F",
-        "sagittarius": u"\u2650",
-        "capricorn": u"\u2651",
-        "aquarius": u"\u2652",
-        "pisces": u"\u2653",
-
-        "trademark": u"\u2122",
-
-        # Happy new year 2014
-        "fir": u"\U0001F384",
-
-        "Box": u"\u2610",
-        "Hbar": u"\u0126",
-        "hbar": u"\u0127",
-        "eth": u"\u00f0",
-
-        "fraction_1_2": u"\u00bd",
-        "fraction_1_4": u"\u00bc",
-        "fraction_3_4": u"\u00be",
-        "fraction_1_7": u"\u2150",
-        "fraction_1_9": u"\u2151",
-        "fraction_1_10": u"\u2152",
-        "fraction_1_3": u"\u2153",
-        "fraction_2_3": u"\u2154",
-        "fraction_1_5": u"\u2155",
-        "fraction_2_5": u"\u2156",
-        "fraction_3_5": u"\u2157",
-        "fraction_4_5": u"\u2158",
-        "fraction_1_6": u"\u2159",
-        "fraction_5_6": u"\u215a",
-        "fraction_1_8": u"\u215b",
-        "fraction_3_8": u"\u215c",
-        "fraction_5_8": u"\u215d",
-        "fraction_7_8": u"\u215e",
-        "fraction_1_": u"\u215f"
-    }
-    return result
-
-def make_synonyms():
-    result = {
-        "all": "forall",
-        "->": "rightarrow",
-        "-/>": "nrightarrow",
-        "-->": "longrightarrow",
-        "=>": "Rightarrow",
-        "=/>": "nRightarrow",
-        "==>": "Longrightarrow",
-        "o": "vysmwhtcircle",
-        "x": "times",
-        "and": "wedge",
-        "or": "vee",
-        "<-": "leftarrow",
-        "</-": "nleftarrow",
-        "<--": "longleftarrow",
-        "<=": "Leftarrow",
-        "</=": "nLeftarrow",
-        "<==": "Longleftarrow",
-        "<->": "leftrightarrow",
-        "<-->": "longleftrightarrow",
-        "<=>": "Leftrightarrow",
-        "<==>": "Longleftrightarrow",
-        "::": "Colon",
-        "==": "equiv",
-        "===": "Equiv",
-        "=/=": "nequiv",
-        "/=": "neq",
-        "~==": "cong",
-        "~/==": "ncong",
-        "~=": "simeq",
-        "=~": "eqsim",
-        "~/=": "nsime",
-        "||": "Vert",
-        "|->": "mapsto",
-        "`": "prime",
-        ">=": "geq",
-        "<=": "leq",
+def make_synonyms():
+    result = {
+        "all": "forall",
+        "->": "rightarrow",
+        "-/>": "nrightarrow",
+        "-->": "longrightarrow",
+        "=>": "Rightarrow",
+        "=/>": "nRightarrow",
+        "==>": "Longrightarrow",
+        "o": "vysmwhtcircle",
+        "x": "times",
+        "and": "wedge",
+        "or": "vee",
+        "<-": "leftarrow",
+        "</-": "nleftarrow",
+        "<--": "longleftarrow",
+        "<=": "Leftarrow",
+        "</=": "nLeftarrow",
+        "<==": "Longleftarrow",
+        "<->": "leftrightarrow",
+        "<-->": "longleftrightarrow",
+        "<=>": "Leftrightarrow",
+        "<==>": "Longleftrightarrow",
+        "::": "Colon",
+        "==": "equiv",
+        "===": "Equiv",
+        "=/=": "nequiv",
+        "/=": "neq",
+        "~==": "cong",
+        "~/==": "ncong",
+        "~=": "simeq",
+        "=~": "eqsim",
+        "~/=": "nsime",
+        "||": "Vert",
+        "|->": "mapsto",
+        "`": "prime",
+        ">=": "geq",
+        "<=": "leq",
 
         "christmastree": "fir",
 
@@ -4871,57 +4035,485 @@ def make_synonyms():
     }
     return result
 
+class CompactTable(Mapping):
+    """
+    Read-only table name -> symbol packed into flat arrays: names sorted in one UTF-8
+    blob with offsets, symbols as code points with offsets and entries ordered by
+    symbol to find names of symbol. Lookups bisect over arrays, so there are no Python
+    objects per entry and table can be mapped from file and shared between processes
+    """
+    MAGIC = b'UMct'
+    HEADER = struct.Struct('=4sIII')  # magic, key, count, number of code points
+    UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+    def __init__(self, buf):
+        if len(buf) < self.HEADER.size:
+            raise ValueError('Compact table is truncated')
+        magic, self.key, self.count, points = self.HEADER.unpack_from(buf)
+        if magic != self.MAGIC:
+            raise ValueError('Not a compact table')
+        view = memoryview(buf)
+        pos = self.HEADER.size
+        arrays = []
+        for size in [self.count + 1, self.count + 1, self.count]:
+            arrays.append(view[pos:pos + 4 * size].cast('I'))
+            pos += 4 * size
+        self.name_offsets, self.value_offsets, self.by_value = arrays
+        self.codepoints = view[pos:pos + 4 * points]
+        self.names_base = pos + 4 * points
+        if len(buf) != self.names_base + self.name_offsets[self.count]:
+            raise ValueError('Compact table is truncated')
+        self.buf = buf
+
+    @classmethod
+    def from_mapping(cls, mapping, key=0):
+        """
+        Packs dict name -> symbol, names of the same symbol keep their order in dict
+        Built without per entry temporary objects, so that building doesn't leave
+        memory fragmented
+        """
+        names = list(mapping)
+        values = [mapping[k] for k in names]
+        order = sorted(range(len(names)), key=names.__getitem__)
+        rank = array('I', bytes(4 * len(names)))
+        for i, j in enumerate(order):
+            rank[j] = i
+        blob = bytearray()
+        name_offsets, value_offsets = array('I', [0]), array('I', [0])
+        for j in order:
+            blob += names[j].encode('utf-8')
+            name_offsets.append(len(blob))
+            value_offsets.append(value_offsets[-1] + len(values[j]))
+        by_value = array('I', [rank[j] for j in sorted(range(len(values)), key=values.__getitem__)])
+        return cls(b''.join([
+            cls.HEADER.pack(cls.MAGIC, key, len(names), value_offsets[-1]),
+            name_offsets.tobytes(),
+            value_offsets.tobytes(),
+            by_value.tobytes(),
+            u''.join(values[j] for j in order).encode(cls.UTF32, 'surrogatepass'),
+            bytes(blob)]))
+
+    @staticmethod
+    def key_of(mapping):
+        """
+        Checksum of dict name -> symbol to check, whether saved table is up to date
+        """
+        key = 0
+        for k, v in mapping.items():
+            key = zlib.crc32(u'{0}\t{1}\n'.format(k, v).encode('utf-8', 'surrogatepass'), key)
+        return key
+
+    def save(self, path):
+        """
+        Writes table to file, file is replaced at once, so that readers never see it partial
+        """
+        tmp = '{0}.{1}.tmp'.format(path, os.getpid())
+        with open(tmp, 'wb') as f:
+            f.write(self.buf)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Maps table from file read-only, pages are shared by all processes mapping it
+        """
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def name_key(self, i):
+        return self.buf[self.names_base + self.name_offsets[i]:self.names_base + self.name_offsets[i + 1]]
+
+    def name(self, i):
+        return self.name_key(i).decode('utf-8')
+
+    def value(self, i):
+        return str(self.codepoints[4 * self.value_offsets[i]:4 * self.value_offsets[i + 1]], self.UTF32, 'surrogatepass')
+
+    def bisect_name(self, key, lo=0):
+        """
+        Index of first name not less than UTF-8 encoded key
+        """
+        buf, base, offsets = self.buf, self.names_base, self.name_offsets
+        hi = self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if buf[base + offsets[mid]:base + offsets[mid + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, name):
+        """
+        Returns index of name, -1 if there is no such name
+        """
+        key = name.encode('utf-8')
+        i = self.bisect_name(key)
+        if i < self.count and self.name_key(i) == key:
+            return i
+        return -1
+
+    def range_of(self, prefix):
+        """
+        Returns bounds (lo, hi) of names starting with prefix
+        """
+        key = prefix.encode('utf-8')
+        lo = self.bisect_name(key)
+        return (lo, self.bisect_name(key + b'\xff', lo))
+
+    def names_of(self, value):
+        """
+        Returns list of names of symbol value
+        """
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.value(self.by_value[mid]) < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        names = []
+        while lo < self.count and self.value(self.by_value[lo]) == value:
+            names.append(self.name(self.by_value[lo]))
+            lo += 1
+        return names
+
+    def __getitem__(self, name):
+        i = self.find(name)
+        if i < 0:
+            raise KeyError(name)
+        return self.value(i)
+
+    def get(self, name, default=None):
+        i = self.find(name)
+        return default if i < 0 else self.value(i)
+
+    def __contains__(self, name):
+        return self.find(name) >= 0
+
+    def __iter__(self):
+        return (self.name(i) for i in range(self.count))
+
+    def __len__(self):
+        return self.count
+
+    def items(self):
+        return ((self.name(i), self.value(i)) for i in range(self.count))
+
+    def values(self):
+        return (self.value(i) for i in range(self.count))
+
+    def extensions(self, prefix):
+        """
+        Yields names starting with prefix in order
+        """
+        lo, hi = self.range_of(prefix)
+        return (self.name(i) for i in range(lo, hi))
+
+    def iter_completions(self, prefix):
+        """
+        Yields (name, symbol) for names starting with prefix in order
+        """
+        lo, hi = self.range_of(prefix)
+        return ((self.name(i), self.value(i)) for i in range(lo, hi))
+
+    def completions(self, prefix):
+        """
+        Returns sorted list of (name, symbol) for names starting with prefix
+        """
+        return list(self.iter_completions(prefix))
+
+
+class LayeredTable(Mapping):
+    """
+    Read-only view of user entries over compact built-in table
+    """
+    def __init__(self, builtin, user):
+        self.builtin = builtin
+        self.user = user
+        self.extra = sorted(k for k in user if k not in builtin)
+
+    def __getitem__(self, name):
+        if name in self.user:
+            return self.user[name]
+        return self.builtin[name]
+
+    def get(self, name, default=None):
+        if name in self.user:
+            return self.user[name]
+        return self.builtin.get(name, default)
+
+    def __contains__(self, name):
+        return name in self.user or name in self.builtin
+
+    def __iter__(self):
+        return merge(self.builtin, self.extra)
+
+    def __len__(self):
+        return len(self.builtin) + len(self.extra)
+
+    def items(self):
+        builtin = ((k, self.user.get(k, v)) for k, v in self.builtin.items())
+        return merge(builtin, [(k, self.user[k]) for k in self.extra])
+
+    def values(self):
+        return (v for _, v in self.items())
+
+    def extensions(self, prefix):
+        """
+        Yields names starting with prefix in order
+        """
+        lo, hi = range_of(self.extra, prefix)
+        return merge(self.builtin.extensions(prefix), self.extra[lo:hi])
+
+    def iter_completions(self, prefix):
+        """
+        Yields (name, symbol) for names starting with prefix in order
+        """
+        builtin = ((k, self.user.get(k, v)) for k, v in self.builtin.iter_completions(prefix))
+        lo, hi = range_of(self.extra, prefix)
+        return merge(builtin, [(k, self.user[k]) for k in self.extra[lo:hi]])
+
+    def completions(self, prefix):
+        """
+        Returns sorted list of (name, symbol) for names starting with prefix
+        """
+        return list(self.iter_completions(prefix))
+
+
 class Translation:
-    def __init__(self, initial_fun, inverse_fun):
+    """
+    Built-in table with user entries layered on top of it
+    Built-in layer is compact table built once or mapped from file, direct is a view
+    of user layer over it. User layer is diffed against previous one on update, so that
+    only symbols of changed names are looked up again in inverse, which keeps only
+    entries differing from built-in ones
+    Entries of lazy_fun are added to built-in layer only by load_lazy
+    If multi=True, inverse maps value to list of names, otherwise to one name
+    """
+    def __init__(self, initial_fun, multi=False, lazy_fun=None):
         self.initial_fun = initial_fun
-        self.inverse_fun = inverse_fun
+        self.multi = multi
+        self.lazy_fun = lazy_fun
+        self.lazy_loaded = lazy_fun is None
+        self.lazy_longest = None
+
+        self.builtin = None
+        self.builtin_path = None
+        self.user_raw = {}
+        self.user = {}
+
+        self.direct = LayeredTable(CompactTable.from_mapping({}), {})
+        self.inverse = {}
+        self.generation = 0
 
-        self.direct = {}
-        self.direct_sorted = []
+    def set_builtin(self, table):
+        """
+        Sets built-in layer, user layer is kept
+        """
+        self.builtin = table
+        self.direct = LayeredTable(table, self.user)
         self.inverse = {}
+        self.refresh_inverse((set(self.user.values()) | set(table.get(k) for k in self.user)) - set([None]))
+        self.generation += 1
+
+    def builtin_source(self, lazy):
+        """
+        Built-in entries, with lazy ones if lazy=True
+        Lazy entries go first, so that other names win as names of the same symbols
+        """
+        direct = self.lazy_fun() if self.lazy_fun is not None and lazy else {}
+        direct.update(self.initial_fun())
+        return direct
+
+    def builtin_table(self):
+        """
+        Returns built-in compact table, it is built only once
+        """
+        if self.builtin is None:
+            self.set_builtin(CompactTable.from_mapping(self.builtin_source(self.lazy_loaded)))
+        return self.builtin
+
+    def load_lazy(self):
+        """
+        Adds lazy entries to built-in layer, generation is changed as after update
+        Layer is mapped, if current one is, and built in memory, if mapping fails
+        Entries are marked loaded only after new layer is installed
+        """
+        if self.lazy_loaded:
+            return
+        if self.builtin is not None:
+            table = None
+            if self.builtin_path is not None:
+                try:
+                    table = self.mapped_table(self.builtin_path, True)
+                except EnvironmentError:
+                    table = None
+            if table is None:
+                table = CompactTable.from_mapping(self.builtin_source(True))
+            self.set_builtin(table)
+        self.lazy_loaded = True
+
+    def mapped_table(self, path, lazy):
+        """
+        Returns compact table mapped from file at path, file is written, if it is missing
+        or made from other built-in entries
+        Table with lazy entries is mapped from file with '-full' suffix
+        """
+        if self.lazy_fun is not None and lazy:
+            root, ext = os.path.splitext(path)
+            path = root + '-full' + ext
+        direct = self.builtin_source(lazy)
+        key = CompactTable.key_of(direct)
+        try:
+            table = CompactTable.load(path)
+        except (EnvironmentError, ValueError):
+            table = None
+        if table is None or table.key != key:
+            CompactTable.from_mapping(direct, key).save(path)
+            table = CompactTable.load(path)
+        return table
+
+    def map_builtin(self, path):
+        """
+        Maps built-in layer from file at path, so that processes using it share memory
+        Path is kept to map lazy entries later only if mapping succeeds
+        """
+        self.set_builtin(self.mapped_table(path, self.lazy_loaded))
+        self.builtin_path = path
+
+    def longest_name(self):
+        """
+        Returns length of longest name, including not loaded lazy ones
+        """
+        longest = max([len(name) for name in self.direct] or [0])
+        if not self.lazy_loaded:
+            if self.lazy_longest is None:
+                self.lazy_longest = max([len(name) for name in self.lazy_fun()] or [0])
+            longest = max(longest, self.lazy_longest)
+        return longest
 
     def update(self, dict_mapping):
-        self.direct = self.initial_fun()
-        self.direct.update(dict((k, replace_codes(v)) for k, v in dict_mapping.items()))
-        self.direct_sorted = sorted(self.direct)
-        self.inverse = self.inverse_fun(self.direct)
+        """
+        Replaces user layer with dict_mapping, applying only changed entries
+        """
+        builtin = self.builtin_table()
+        old_raw, old_user, old_direct = self.user_raw, self.user, self.direct
+        # Decode codes only for new or changed entries
+        user = dict(
+            (k, old_user[k] if old_raw.get(k) == v else replace_codes(v))
+            for k, v in dict_mapping.items())
+        self.user_raw, self.user = dict(dict_mapping), user
+        self.direct = LayeredTable(builtin, user)
+
+        touched = set()
+        for k in set(old_user) | set(user):
+            old_value, new_value = old_direct.get(k), self.direct.get(k)
+            if old_value != new_value:
+                touched.update(v for v in [old_value, new_value] if v is not None)
+        if touched:
+            if not user:
+                self.inverse = {}
+            self.refresh_inverse(touched)
+            self.generation += 1
+
+    def refresh_inverse(self, values):
+        """
+        Looks up names of values again after user layer is changed
+        """
+        if not self.user:
+            return
+        user_names = {}
+        for k, v in self.user.items():
+            if v in values:
+                user_names.setdefault(v, []).append(k)
+        for value in values:
+            names = [n for n in self.builtin.names_of(value) if self.direct.get(n) == value]
+            names.extend(n for n in user_names.get(value, []) if self.builtin.get(n) != value)
+            self.inverse[value] = names if self.multi else (names[-1] if names else None)
+
+    def inverse_of(self, value):
+        """
+        Returns name of value (list of names if multi=True), None (empty list) if there is no one
+        """
+        if value in self.inverse:
+            return self.inverse[value]
+        names = self.builtin.names_of(value) if self.builtin is not None else []
+        return names if self.multi else (names[-1] if names else None)
+
+
+LAST_CHAR = u'\U0010FFFF'
 
 CODE_RE = re.compile(r'\\u([\da-fA-F]{4})|\\U([\da-fA-F]{8})|\\U\+([\da-fA-F]{4,8})')
+MAX_CODE_LEN = len(u'\\U+XXXXXXXX')
 
 
 def uchr(s):
     return chr(s) if PyV3 else unichr(s)
 
 
+def code_match_symbol(m):
+    """
+    Gets symbol by match of CODE_RE, None if code is out of unicode range
+    """
+    u = int(m.group(1) or m.group(2) or m.group(3), base=16)
+    if u > 0x10FFFF:
+        return None
+    if PyV3 or u < 0xFFFF:
+        return uchr(u)
+    else:
+        a = u / 0x0400 + 0xd7c0
+        b = (u & 0x03ff) + 0xdc00
+        return unichr(a) + unichr(b)
+
+
 def symbol_by_code(codestr):
     """
     Gets symbol by code string '\\uXXXX', '\\UXXXXXXXX' or '\\U+XXXX[XXXX]'
     """
     m = CODE_RE.search(codestr)
     if m and m.end() == len(codestr):
-        u = int(m.group(1) or m.group(2) or m.group(3), base=16)
-        if PyV3 or u < 0xFFFF:
-            return uchr(u)
-        else:
-            a = u / 0x0400 + 0xd7c0
-            b = (u & 0x03ff) + 0xdc00
-            return unichr(a) + unichr(b)
+        return code_match_symbol(m)
     return None
 
 
+def code_replacement(m):
+    symbol = code_match_symbol(m)
+    return m.group(0) if symbol is None else symbol
+
+
 def replace_codes(s):
     """
     Replaces '\\uXXXX', '\\UXXXXXXXX' and '\\U+XXXX[XXXX]' with corresponding symbols
+    Codes out of unicode range are left as is
     """
     if not s:
         return s
-    m = CODE_RE.search(s)
-    if not m:
-        return s
-    before = s[:m.start()]
-    code = s[m.start():m.end()]
-    after = s[m.end():]
-    return before + symbol_by_code(code) + replace_codes(after)
+    return CODE_RE.sub(code_replacement, s)
+
+
+decode_codes = replace_codes
+
+
+def decode_codes_stream(chunks):
+    """
+    Replaces codes in text given as iterable of chunks, yields decoded chunks
+    Text is split at backslash, when code may cross chunk boundary
+    """
+    rest = u''
+    for chunk in chunks:
+        text = rest + chunk
+        # Code, that doesn't end before cut, starts with backslash not earlier
+        # than MAX_CODE_LEN - 1 chars before cut and contains no other backslashes
+        cut = max(0, len(text) - MAX_CODE_LEN + 1)
+        backslash = text.rfind(u'\\', max(0, cut - MAX_CODE_LEN + 1), cut)
+        if backslash != -1:
+            cut = backslash
+        rest = text[cut:]
+        if cut:
+            yield replace_codes(text[:cut])
+    if rest:
+        yield replace_codes(rest)
 
 
 def code_by_symbol(sym):
@@ -4942,29 +4534,17 @@ def code_by_symbol(sym):
     return None
 
 
-def get_settings():
-    return sublime.load_settings('UnicodeMath.sublime-settings')
-
+maths = Translation(make_maths, lazy_fun=make_emoji)
+synonyms = Translation(make_synonyms, multi=True)
 
-def update_and_subscribe(tr, key):
-    def refill():
-        tr.update(get_settings().get(key, {}))
-    refill()
-    get_settings().add_on_change(key, refill)
+EMOJI_PREFIX = u':'
 
-
-def make_inverse_maths(direct):
-    return dict((v, k) for k, v in direct.items())
-
-
-def make_inverse_synonyms(direct):
-    inverse_synonyms = {}
-    for k, v in direct.items():
-        inverse_synonyms.setdefault(v, []).append(k)
-    return inverse_synonyms
-
-maths = Translation(make_maths, make_inverse_maths)
-synonyms = Translation(make_synonyms, make_inverse_synonyms)
+def require_names(prefix=u''):
+    """
+    Loads emoji, if names starting with prefix may be emoji
+    """
+    if not maths.lazy_loaded and (not prefix or prefix.startswith(EMOJI_PREFIX)):
+        maths.load_lazy()
 
 def names_by_symbol(symbol):
     """
@@ -4972,43 +4552,121 @@ def names_by_symbol(symbol):
     If no symbol found, returns empty list
     """
     global maths, synonyms
-    res = []
-    name = maths.inverse.get(symbol, None)
+    require_names()
+    name = maths.inverse_of(symbol)
     if not name:
-        return res
-    res.append(name)
-    if name:
-        res.extend(synonyms.inverse.get(name, []))
-    return res
+        return []
+    return [name] + synonyms.inverse_of(name)
 
 
-def symbol_by_name(name, exclude=None):
+def resolve_names(direct, synonyms_direct):
     """
-    Returns symbol by name or synonym or None
-    exclude is used to prevent loops in synonyms
+    Resolves all synonym chains to symbols
+    Returns (dict synonym -> symbol, list of problems with synonyms)
+    Names of symbols take precedence over synonyms with the same name, such
+    synonyms are left out
+    """
+    resolved = {}
+    failed = set()
+    problems = []
+    for name in synonyms_direct:
+        if name in resolved or name in failed or name in direct:
+            continue
+        chain = [name]
+        target = synonyms_direct[name]
+        while True:
+            value = resolved.get(target) or direct.get(target)
+            if value is not None:
+                break
+            if target in failed:
+                break
+            if target in chain:
+                cycle = chain[chain.index(target):]
+                problems.append(u'synonyms form a cycle: {0}'.format(u' -> '.join(cycle + [target])))
+                break
+            if target not in synonyms_direct:
+                problems.append(u'synonym {0} refers to unknown name {1}'.format(chain[-1], target))
+                break
+            chain.append(target)
+            target = synonyms_direct[target]
+        if value is None:
+            failed.update(chain)
+        else:
+            for n in chain:
+                resolved[n] = value
+    return (resolved, problems)
 
+def tables_generation():
     """
-    if exclude is None:
-        exclude = []
-    global maths, synonyms
-    if name in exclude:
-        return None
-    if name in maths.direct:
-        return maths.direct[name]
-    if name in synonyms.direct:
-        exclude.append(name)
-        return symbol_by_name(synonyms.direct[name], exclude)  # synonym may ref on other synonym
-    return None
+    Changes each time symbols or synonyms are updated
+    """
+    return (maths.generation, synonyms.generation)
+
+def generation_cached(fun):
+    """
+    Caches results of fun by its arguments until symbols or synonyms are updated
+    Result is stored for generation after call, as fun may load lazy names
+    """
+    cache = [None, {}]
+
+    @wraps(fun)
+    def cached(*args):
+        results = cache[1]
+        if cache[0] == tables_generation() and args in results:
+            return results[args]
+        result = fun(*args)
+        key = tables_generation()
+        if cache[0] != key:
+            cache[:] = [key, {}]
+        cache[1][args] = result
+        return result
+    return cached
+
+@generation_cached
+def resolved_names():
+    """
+    Returns (dict synonym -> symbol, problems), rebuilt only after symbols or synonyms are updated
+    """
+    if any(name.startswith(EMOJI_PREFIX) for name in synonyms.direct.values()):
+        require_names(EMOJI_PREFIX)
+    return resolve_names(maths.direct, synonyms.direct)
+
+
+def synonym_problems():
+    """
+    Returns list of cyclic or dangling synonyms descriptions
+    """
+    return resolved_names()[1]
+
 
-def extensions_of(sorted_strings, prefix):
+def symbol_by_name(name):
     """
-    Yields all of the strings in sorted_strings that start with prefix.
+    Returns symbol by name or synonym or None
     """
+    if name[:1] == EMOJI_PREFIX:
+        require_names(name)
+    return resolved_names()[0].get(name) or maths.direct.get(name)
 
-    i = bisect.bisect_left(sorted_strings, prefix)
-    while i < len(sorted_strings) and sorted_strings[i].startswith(prefix):
-        yield sorted_strings[i]
-        i += 1
+def alphabet_text(style, chars):
+    """
+    Returns chars in math alphabet style computed from code points, None if some
+    char has no such letter or user has redefined it, so that it's looked up by name
+    """
+    reps = []
+    for ch in chars:
+        rep = alphabet_symbol(style, ch)
+        if rep is None or style + ch in maths.user:
+            return None
+        reps.append(rep)
+    return u''.join(reps)
+
+def range_of(sorted_strings, prefix):
+    """
+    Returns bounds (lo, hi) of the strings in sorted_strings that start with prefix
+    """
+    lo = bisect.bisect_left(sorted_strings, prefix)
+    hi = bisect.bisect_left(sorted_strings, prefix + LAST_CHAR, lo)
+    return (lo, hi)
 
 def symbol_by_prefix(prefix, *, unique=False):
     """
@@ -5017,19 +4675,315 @@ def symbol_by_prefix(prefix, *, unique=False):
     """
 
     # determine whether there are 2+ options without generating everything
-    options = chain(
-        extensions_of(maths.direct_sorted, prefix),
-        extensions_of(synonyms.direct_sorted, prefix)
-    )
+    require_names(prefix)
+    options = completion_index().extensions(prefix)
     hit1 = next(options, None)
     hit2 = next(options, None)
     if hit1 is not None and (not unique or hit2 is None):
         return symbol_by_name(hit1)
 
-def plugin_loaded():
-    global maths, synonyms
-    update_and_subscribe(maths, 'symbols')
-    update_and_subscribe(synonyms, 'synonyms')
+# Families of names sharing leading chars, completions of prefix, that belongs to family,
+# are taken from partition of family names and sorted in family order
+EMOJI_FAMILY = 'emoji'
+SCRIPTS_FAMILY = 'scripts'
+ALPHABETS_FAMILY = 'alphabets'
+
+SCRIPT_CHARS = u'0123456789+-=()abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+def name_family(name):
+    """
+    Returns family of name or None; for prefix it's family of all names starting with it
+    """
+    if name.startswith(EMOJI_PREFIX):
+        return EMOJI_FAMILY
+    if name[:1] in ('^', '_'):
+        return SCRIPTS_FAMILY
+    if ALPHABET_RE.match(name):
+        return ALPHABETS_FAMILY
+    return None
+
+def emoji_order(name, symbol):
+    """
+    Emoji go in order of code points, so that similar ones are together
+    """
+    return (symbol, name)
+
+def script_order(name, symbol):
+    """
+    Superscripts, then subscripts, each in order of digits, signs and letters
+    """
+    pos = SCRIPT_CHARS.find(name[1:]) if len(name) == 2 else -1
+    return (name[0] != '^', pos < 0, pos, name)
+
+def alphabet_order(name, symbol):
+    """
+    Letters of style together: latin ones, then greek and others in order of code points
+    """
+    style = ALPHABET_RE.match(name).group(0)
+    letter = name[len(style):]
+    return (style, len(letter) > 1, symbol if len(letter) > 1 else letter, name)
+
+FAMILY_ORDERS = {
+    EMOJI_FAMILY: emoji_order,
+    SCRIPTS_FAMILY: script_order,
+    ALPHABETS_FAMILY: alphabet_order,
+}
+
+class FamilyPartition:
+    """
+    (name, symbol) pairs of one family sorted by name, so that prefix is found by bisect,
+    with rank of each pair in family order
+    """
+    def __init__(self, pairs, order):
+        self.pairs = pairs
+        self.names = [k for k, _ in pairs]
+        ids = sorted(range(len(pairs)), key=lambda i: order(*pairs[i]))
+        self.ordered = [pairs[i] for i in ids]
+        self.rank = array('I', [0]) * len(pairs)
+        for r, i in enumerate(ids):
+            self.rank[i] = r
+
+    def completions(self, prefix):
+        """
+        Returns (name, symbol) pairs for names starting with prefix in family order
+        """
+        lo, hi = range_of(self.names, prefix)
+        if hi - lo == len(self.pairs):
+            return list(self.ordered)
+        return [self.pairs[i] for i in sorted(range(lo, hi), key=self.rank.__getitem__)]
+
+class CompletionIndex:
+    """
+    Names and synonyms paired with their symbols and sorted by name, so that
+    completions for a prefix are merged from slices of symbols table and of
+    resolved synonyms found by bisect
+    Prefixes of one family are completed from its partition, built on first use
+    """
+    def __init__(self, direct, resolved):
+        self.direct = direct
+        self.synonyms = sorted(resolved.items())
+        self.synonym_names = [k for k, _ in self.synonyms]
+        self.partitions = {}
+
+    def extensions(self, prefix):
+        """
+        Yields names and synonyms starting with prefix in order
+        """
+        lo, hi = range_of(self.synonym_names, prefix)
+        return merge(self.direct.extensions(prefix), self.synonym_names[lo:hi])
 
-if int(sublime.version()) < 3000:
-    plugin_loaded()
+    def sorted_completions(self, prefix):
+        """
+        Yields (name, symbol) for names starting with prefix sorted by name
+        """
+        lo, hi = range_of(self.synonym_names, prefix)
+        return merge(self.direct.iter_completions(prefix), self.synonyms[lo:hi])
+
+    def partition(self, family):
+        """
+        Returns partition of names of family
+        """
+        if family not in self.partitions:
+            pairs = []
+            for prefix in self.family_prefixes(family):
+                pairs.extend(pair for pair in self.sorted_completions(prefix) if name_family(pair[0]) == family)
+            self.partitions[family] = FamilyPartition(pairs, FAMILY_ORDERS[family])
+        return self.partitions[family]
+
+    @staticmethod
+    def family_prefixes(family):
+        """
+        Sorted prefixes, that all names of family start with
+        """
+        if family == EMOJI_FAMILY:
+            return [EMOJI_PREFIX]
+        if family == SCRIPTS_FAMILY:
+            return ['^', '_']
+        return ['B', 'm']
+
+    def iter_completions(self, prefix):
+        """
+        Yields (name, symbol) for names starting with prefix in order, so that
+        only needed part of completions is decoded; names of one family go in family order
+        """
+        family = name_family(prefix)
+        if family is not None:
+            return iter(self.partition(family).completions(prefix))
+        return self.sorted_completions(prefix)
+
+    def completions(self, prefix):
+        """
+        Returns list of (name, symbol) for names starting with prefix in order
+        """
+        return list(self.iter_completions(prefix))
+
+@generation_cached
+def completion_index():
+    """
+    Returns completion index, it is rebuilt only after symbols or synonyms are updated
+    """
+    return CompletionIndex(maths.direct, resolved_names()[0])
+
+SCRIPT_NAMES = {'^': 'superscript', '_': 'subscript'}
+
+@generation_cached
+def script_table(script_char):
+    """
+    Returns table for str.translate, which maps chars to superscripts ('^') or
+    subscripts ('_') by one-char names, it is rebuilt only after symbols or synonyms are updated
+    """
+    if script_char not in SCRIPT_NAMES:
+        raise ValueError('Unknown script: {0}'.format(script_char))
+    return dict(
+        (ord(name[1]), symbol)
+        for name, symbol in completion_index().iter_completions(script_char)
+        if len(name) == 2)
+
+def trigrams(s):
+    """
+    Returns set of all substrings of length 3 of s
+    """
+    return set(s[i:i + 3] for i in range(len(s) - 2))
+
+
+def is_subsequence(query, s):
+    """
+    Whether chars of query occur in s in the same order
+    """
+    i = 0
+    for ch in query:
+        i = s.find(ch, i) + 1
+        if not i:
+            return False
+    return True
+
+
+class SearchIndex:
+    """
+    Trigram index over names and synonyms: each trigram maps to array of ids of names
+    containing it, so that only names sharing trigrams with query are scored
+    Names sharing at least half of query trigrams match, as do names sharing some
+    and containing query as subsequence; they are scored by the share with bonuses for prefix, substring and
+    subsequence match, shorter names win ties. Case is ignored, but names
+    with the same case as query go first
+    Queries shorter than trigram are matched as substrings by scan
+    """
+    def __init__(self, names):
+        self.names = sorted(names)
+        self.keys = [name.lower() for name in self.names]
+        self.trigrams = {}
+        for i, key in enumerate(self.keys):
+            for t in trigrams(key):
+                if t not in self.trigrams:
+                    self.trigrams[t] = array('I')
+                self.trigrams[t].append(i)
+
+    def candidates(self, query):
+        """
+        Returns dict id -> number of trigrams of query, that name contains
+        """
+        counts = {}
+        for t in trigrams(query):
+            for i in self.trigrams.get(t, ()):
+                counts[i] = counts.get(i, 0) + 1
+        return counts
+
+    @staticmethod
+    def score(query, key, shared, total):
+        pos = key.find(query)
+        if pos == 0:
+            bonus = 3
+        elif pos > 0:
+            bonus = 2
+        elif is_subsequence(query, key):
+            bonus = 1
+        else:
+            bonus = 0
+        return bonus + float(shared) / total - 0.001 * len(key)
+
+    def search(self, query, limit=None):
+        """
+        Returns names matching query, best first, at most limit of them
+        """
+        exact, query = query, query.lower()
+        if len(query) < 3:
+            scored = [
+                (self.score(query, key, 1, 1), self.names[i])
+                for i, key in enumerate(self.keys) if query in key]
+        else:
+            total = len(trigrams(query))
+            scored = [
+                (self.score(query, self.keys[i], shared, total), self.names[i])
+                for i, shared in self.candidates(query).items()
+                if 2 * shared >= total or is_subsequence(query, self.keys[i])]
+        key = lambda item: (-item[0] - 0.5 * (exact in item[1]), item[1])
+        best = heapq.nsmallest(limit, scored, key=key) if limit else sorted(scored, key=key)
+        return [name for _, name in best]
+
+def search_index(family=None):
+    """
+    Returns search index of names of family or of all names, it is built on first search
+    and rebuilt only after symbols or synonyms are updated
+    """
+    return family_search_index(family)
+
+@generation_cached
+def family_search_index(family):
+    """
+    Search index of family, None for all names, cached by family as passed
+    """
+    if family is None or family == EMOJI_FAMILY:
+        maths.load_lazy()
+    index = completion_index()
+    names = index.extensions(u'') if family is None else index.partition(family).names
+    return SearchIndex(names)
+
+
+def search_symbols(query, limit=None):
+    """
+    Returns (name, symbol) pairs for names and synonyms matching query by substring or fuzzy, best first
+    Query starting as names of one family is searched only among them
+    """
+    index = search_index(name_family(query))
+    return [(name, symbol_by_name(name)) for name in index.search(query, limit)]
+
+class ReverseIndex:
+    """
+    Suffix trie over symbols to find longest symbol ending at given position in one walk
+    Each node maps previous char to next node, key None marks end of symbol
+    """
+    def __init__(self, symbols):
+        self.trie = {}
+        self.max_len = 0
+        for symbol in symbols:
+            node = self.trie
+            for ch in reversed(symbol):
+                node = node.setdefault(ch, {})
+            node[None] = True
+            self.max_len = max(self.max_len, len(symbol))
+
+    def longest_suffix(self, text, end=None, begin=0):
+        """
+        Returns length of longest symbol text[begin:end] ends with, 0 if there is none
+        """
+        if end is None:
+            end = len(text)
+        node = self.trie
+        found = 0
+        i = end
+        while i > begin:
+            node = node.get(text[i - 1])
+            if node is None:
+                break
+            i -= 1
+            if None in node:
+                found = end - i
+        return found
+
+@generation_cached
+def reverse_index():
+    """
+    Returns reverse index of symbols, it is rebuilt only after symbols or synonyms are updated
+    """
+    require_names()
+    return ReverseIndex(set(maths.direct.values()))
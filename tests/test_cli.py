@@ -0,0 +1,47 @@
+"""
+Tests of command line converter, run with `python -m unittest discover tests`
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tools', 'cli.py')
+
+
+class TestStdout(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.paths = []
+        for name, text in [('a.md', u'\\alpha\n'), ('b.md', u'\\beta\n')]:
+            path = os.path.join(self.dir, name)
+            with open(path, 'wb') as f:
+                f.write(text.encode('utf-8'))
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def run_cli(self, args, stdin=b'', returncode=0):
+        proc = subprocess.Popen(
+            [sys.executable, CLI] + args,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = proc.communicate(stdin)
+        self.assertEqual(proc.returncode, returncode, err)
+        return out.decode('utf-8')
+
+    def test_two_files(self):
+        self.assertEqual(self.run_cli(self.paths), u'\u03b1\n\u03b2\n')
+
+    def test_stdin_and_file(self):
+        self.assertEqual(self.run_cli(['-', self.paths[1]], b'\\gamma\n'), u'\u03b3\n\u03b2\n')
+
+    def test_negative_jobs(self):
+        self.run_cli(['-i', '-j', '-1', self.dir], returncode=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
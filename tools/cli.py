@@ -0,0 +1,283 @@
+"""
+Command line converter of escapes to symbols
+
+    python tools/cli.py [options] [file or directory ...]
+
+Reads stdin and writes stdout when no file (or '-') is given
+Kept out of package root, where Sublime would load it as plugin
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from engine import *
+
+
+CHUNK_SIZE = 1 << 16
+EXTENSIONS = ['.agda', '.lagda', '.lean', '.md']
+
+
+def read_chunks(f, size=CHUNK_SIZE):
+    """
+    Yields chunks of text file f
+    """
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def open_text(path, mode):
+    """
+    Opens file as utf-8 text, keeping line endings and invalid bytes as is
+    """
+    return io.open(path, mode, encoding='utf-8', errors='surrogateescape', newline='')
+
+
+_std_streams = {}
+
+
+def std_stream(stream):
+    """
+    Returns utf-8 text wrapper of stdin or stdout, it's made once per stream, as
+    collected wrapper would close the stream under it
+    """
+    if stream not in _std_streams:
+        _std_streams[stream] = io.TextIOWrapper(stream.buffer, encoding='utf-8', errors='surrogateescape', newline='')
+    return _std_streams[stream]
+
+
+def make_transform(args, config, missing=None):
+    """
+    Returns function, which converts iterable of chunks to pairs (source, converted)
+    Chars, that can't be converted to script, are added to set missing
+    """
+    if args.back:
+        return lambda chunks: convert_back_pieces(chunks, args.policy, args.unknown_to_code)
+    if args.stylize:
+        return lambda chunks: transform_pieces(chunks, lambda text: stylize(text, args.stylize))
+    if args.script:
+        return lambda chunks: convert_script_pieces(chunks, args.script, args.partial, missing)
+    return lambda chunks: convert_pieces(chunks, config=config)
+
+
+def check_file(f, transform):
+    """
+    Returns whether conversion changes text of file f
+    """
+    return any(source != converted for source, converted in transform(read_chunks(f)))
+
+
+def convert_file(src, dst, transform):
+    """
+    Writes converted text of src to dst, returns whether it changed
+    """
+    changed = False
+    for source, converted in transform(read_chunks(src)):
+        changed = changed or source != converted
+        dst.write(converted)
+    return changed
+
+
+def convert_in_place(path, transform):
+    """
+    Rewrites file with converted text if it changes, returns whether it changed
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with open_text(path, 'r') as src:
+            with io.open(fd, 'w', encoding='utf-8', errors='surrogateescape', newline='') as dst:
+                changed = convert_file(src, dst, transform)
+        if changed:
+            shutil.copymode(path, tmp)
+            os.replace(tmp, path)
+        return changed
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def process(path, args, config):
+    """
+    Processes one file (or stdin for '-'), returns whether it changed
+    Chars, that can't be converted to script, are reported to stderr
+    """
+    missing = set()
+    changed = process_transform(path, args, make_transform(args, config, missing))
+    if missing:
+        sys.stderr.write(u'{0}: no {1} for {2}\n'.format(path, SCRIPT_NAMES[args.script], u' '.join(u"'{0}'".format(ch) for ch in sorted(missing))))
+    return changed
+
+
+def process_transform(path, args, transform):
+    """
+    Processes one file (or stdin for '-') with transform, returns whether it changed
+    """
+    if path == '-':
+        src = std_stream(sys.stdin)
+        if args.check:
+            return check_file(src, transform)
+        dst = std_stream(sys.stdout)
+        changed = convert_file(src, dst, transform)
+        dst.flush()
+        return changed
+    if args.check:
+        with open_text(path, 'r') as src:
+            return check_file(src, transform)
+    if args.in_place:
+        return convert_in_place(path, transform)
+    with open_text(path, 'r') as src:
+        dst = std_stream(sys.stdout)
+        changed = convert_file(src, dst, transform)
+        dst.flush()
+        return changed
+
+
+def iter_paths(paths, extensions):
+    """
+    Yields files, directories are walked recursively for files with given extensions
+    Hidden files and directories are skipped
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for name in sorted(files):
+                if not name.startswith('.') and os.path.splitext(name)[1] in extensions:
+                    yield os.path.join(root, name)
+
+
+_worker_state = None
+
+
+def init_worker(args, config):
+    """
+    Pool initializer; forked workers share symbol tables loaded by parent,
+    spawned ones have to load their own
+    """
+    global _worker_state
+    _worker_state = (args, config)
+    if not maths.direct:
+        load_tables()
+
+
+def process_path(path):
+    """
+    Processes file in worker, returns (path, changed, size, error)
+    """
+    args, config = _worker_state
+    try:
+        size = os.path.getsize(path) if path != '-' else 0
+        return (path, process(path, args, config), size, None)
+    except (IOError, OSError, UnicodeError) as e:
+        return (path, False, 0, str(e))
+
+
+def run_jobs(paths, args, config):
+    """
+    Yields results of process_path for paths, in a process pool if args.jobs > 1
+    """
+    if args.jobs == 1:
+        init_worker(args, config)
+        for path in paths:
+            yield process_path(path)
+        return
+    # Fork shares already loaded tables with workers copy-on-write, so emoji are
+    # loaded here, otherwise each worker would build its own copy on first ':'
+    maths.load_lazy()
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    pool = context.Pool(args.jobs or None, initializer=init_worker, initargs=(args, config))
+    try:
+        for result in pool.imap(process_path, paths, chunksize=16):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description='Convert \\name escapes to unicode symbols and back')
+    parser.add_argument('paths', metavar='file', nargs='*', help="files or directories to convert, '-' for stdin")
+    parser.add_argument('-i', '--in-place', action='store_true', help='rewrite files instead of printing them')
+    parser.add_argument('--check', action='store_true', help="don't write anything, list files which would change and exit with 1")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='number of worker processes, 0 for number of cores')
+    parser.add_argument('--ext', action='append', help='extension of files to convert in directories, default: {0}'.format(' '.join(EXTENSIONS)))
+    parser.add_argument('--stats', action='store_true', help='print throughput to stderr')
+    parser.add_argument('--back', action='store_true', help='convert non-ASCII symbols back to escapes')
+    parser.add_argument('--policy', choices=BACK_POLICIES, default='name', help='escape to use with --back: main name, shortest synonym or unicode code')
+    parser.add_argument('--unknown-to-code', action='store_true', help='with --back, convert chars without name to unicode codes')
+    parser.add_argument('--stylize', metavar='STYLE', choices=[st for st, _ in ALPHABET_STYLE_NAMES], help='convert letters and digits to math alphabet instead: {0}'.format(
+        ', '.join('{0} ({1})'.format(st, name) for st, name in ALPHABET_STYLE_NAMES)))
+    parser.add_argument('--script', choices=sorted(SCRIPT_NAMES), help="convert text to superscript ('^') or subscript ('_') instead, words with chars without such form are left as is")
+    parser.add_argument('--partial', action='store_true', help='with --script, convert words partially, leaving only chars without script form')
+    parser.add_argument('--accept-prefixes', action='store_true', help='treat non-ambiguous prefix as full name')
+    parser.add_argument('--no-codes', action='store_true', help="don't convert \\uXXXX codes")
+    parser.add_argument('--no-sub-super', action='store_true', help="don't convert multichar sub- and superscripts")
+    parser.add_argument('--no-list', action='store_true', help="don't convert \\\\prefix\\chars lists")
+    return parser
+
+
+def main(argv=None):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    paths = args.paths or ['-']
+    if not (args.in_place or args.check):
+        if args.jobs != 1 or any(os.path.isdir(p) for p in paths):
+            parser.error('directories and --jobs require --in-place or --check')
+    if sum(map(bool, [args.back, args.stylize, args.script])) > 1:
+        parser.error('--back, --stylize and --script are exclusive')
+    if args.jobs < 0:
+        parser.error('--jobs must be 0 or positive')
+    if args.jobs != 1 and '-' in paths:
+        parser.error("stdin can't be processed with --jobs")
+    config = Config(
+        accept_prefixes=args.accept_prefixes,
+        convert_sub_super=not args.no_sub_super,
+        convert_codes=not args.no_codes,
+        convert_list=not args.no_list)
+    load_tables()
+
+    start = time.time()
+    files = 0
+    total_size = 0
+    changed = []
+    failed = False
+    for path, path_changed, size, error in run_jobs(iter_paths(paths, args.ext or EXTENSIONS), args, config):
+        files += 1
+        total_size += size
+        if error is not None:
+            failed = True
+            sys.stderr.write('{0}: {1}\n'.format(path, error))
+        elif path_changed:
+            changed.append(path)
+    if args.stats:
+        elapsed = max(time.time() - start, 1e-6)
+        sys.stderr.write('{0} files, {1:.1f} MB in {2:.2f} s: {3:.0f} files/s, {4:.1f} MB/s\n'.format(
+            files, total_size / 1e6, elapsed, files / elapsed, total_size / 1e6 / elapsed))
+        if args.jobs == 1:
+            cache = replacement_cache_info()
+            sys.stderr.write('replacement cache: {0} hits, {1} misses\n'.format(cache.hits, cache.misses))
+    if failed:
+        return 2
+    if args.check:
+        for path in changed:
+            if path != '-':
+                print(path)
+        return 1 if changed else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
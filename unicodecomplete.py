@@ -1,20 +1,23 @@
 import sublime
 import sublime_plugin
+import os
 import re
+from collections import namedtuple
+from itertools import islice
 from sys import version
 
 if int(sublime.version()) < 3000:
     from mathsymbols import *
+    from engine import *
+    from usage import *
 else:
     from UnicodeMath.mathsymbols import *
+    from UnicodeMath.engine import *
+    from UnicodeMath.usage import *
 
 PyV3 = version[0] == "3"
 
 
-UNICODE_SYMBOL_RE = re.compile(r'(?:\\)(?P<symbol>[^\s\\\.,]+)')
-UNICODE_RE = re.compile(r'(?:\\)(?:(?P<symbol>[^\s\\\.,]+)|(?:\\(?P<prefix>[^\s\\\.,]+)\\(?P<chars>[^\s\\\.,]+)))')
-UNICODE_SYMBOL_PREFIX_RE = re.compile(r'(?:\\)(?P<symbol>[^\\]+)$')
-UNICODE_PREFIX_RE = re.compile(r'(?:\\)(?:(?P<symbol>[^\\]+)|(?:\\(?P<prefix>[^\s\\\.,]+)\\(?P<chars>[^\s\\\.,]+ ?)))$')
 SYNTAX_RE = re.compile(r'(.*?)/(?P<name>[^/]+)\.(?:tmLanguage|sublime-syntax)')
 
 
@@ -22,83 +25,141 @@ def log(message):
     print(u'UnicodeMath: {0}'.format(message))
 
 
-def get_line_contents(view, location):
-    """
-    Returns the contents of the line at the given location
-    """
-    return view.substr(sublime.Region(view.line(location).a, location))
+def get_settings():
+    return sublime.load_settings('UnicodeMath.sublime-settings')
+
 
+def frozen_items(mapping):
+    return tuple(sorted((mapping or {}).items()))
 
-def is_script(s):
+
+class Settings(namedtuple('Settings', [
+        'convert_on_space', 'symbols', 'synonyms', 'ignore_syntax', 'convert_codes',
+        'convert_sub_super', 'convert_list', 'convert_instantly', 'accept_prefixes',
+        'trailing_space', 'selection_single_replace', 'convert_back_policy',
+        'rank_completions', 'completions_limit', 'completion_mode'])):
+    """
+    Immutable snapshot of UnicodeMath.sublime-settings, defaults are the same as there
+    Symbols and synonyms are sorted tuples of (name, value) pairs
+    Conversion flags are also available as engine Config in config property
+    """
+    __slots__ = ()
+
+    def __new__(
+            cls, convert_on_space=True, symbols=None, synonyms=None, ignore_syntax=('latex',),
+            convert_codes=True, convert_sub_super=True, convert_list=True, convert_instantly=False,
+            accept_prefixes=False, trailing_space=False, selection_single_replace=True,
+            convert_back_policy='name', rank_completions=True, completions_limit=100,
+            completion_mode='prefix'):
+        return super(Settings, cls).__new__(
+            cls, bool(convert_on_space), frozen_items(symbols), frozen_items(synonyms),
+            frozenset(ignore_syntax or ()), bool(convert_codes), bool(convert_sub_super),
+            bool(convert_list), bool(convert_instantly), bool(accept_prefixes),
+            bool(trailing_space), bool(selection_single_replace), convert_back_policy,
+            bool(rank_completions), int(completions_limit or 0), completion_mode)
+
+    @classmethod
+    def load(cls, settings):
+        """
+        Makes snapshot of sublime.Settings, missing keys get default values
+        """
+        defaults = cls()
+        return cls(**dict((name, settings.get(name, getattr(defaults, name))) for name in cls._fields))
+
+    @property
+    def config(self):
+        return Config(
+            accept_prefixes=self.accept_prefixes,
+            convert_sub_super=self.convert_sub_super,
+            convert_codes=self.convert_codes,
+            convert_list=self.convert_list)
+
+settings = Settings()
+config = settings.config
+# Changes on each reload, so that results depending on settings can be cached
+settings_generation = 0
+
+
+def reload_settings():
     """
-    Subscript _... or superscript ^...
+    Rebuilds settings snapshot, updates symbol tables when they're changed
+    Called on settings change only, so that hot paths read plain attributes
     """
-    return s.startswith('_') or s.startswith('^')
+    global settings, config, settings_generation
+    old, settings = settings, Settings.load(get_settings())
+    settings_generation += 1
+    config = settings.config
+    _syntax_allowed.clear()
+    generation = tables_generation()
+    if old.symbols != settings.symbols or not maths.generation:
+        maths.update(dict(settings.symbols))
+    if old.synonyms != settings.synonyms or not synonyms.generation:
+        synonyms.update(dict(settings.synonyms))
+    if tables_generation() != generation:
+        for problem in synonym_problems():
+            log(problem)
+        if hasattr(sublime, 'set_timeout_async'):
+            # Prepare items of insert panel in background, so that it opens at once
+            sublime.set_timeout_async(insert_items, 0)
+
+
+usage = UsageStore()
+USAGE_SAVE_DELAY = 5000  # ms
+_usage_save_pending = False
+
+
+def record_usage(names):
+    """
+    Counts uses of names, saving is batched and done in background
+    """
+    global _usage_save_pending
+    for name in names:
+        usage.record(name)
+    if not _usage_save_pending and usage.path is not None and hasattr(sublime, 'set_timeout_async'):
+        _usage_save_pending = True
+        sublime.set_timeout_async(save_usage, USAGE_SAVE_DELAY)
+
 
+def save_usage():
+    global _usage_save_pending
+    _usage_save_pending = False
+    try:
+        usage.save()
+    except EnvironmentError as e:
+        log(u'can\'t save usage statistics: {0}'.format(e))
 
-def get_script(s):
-    return (s[0], list(s[1:]))
 
+def plugin_loaded():
+    if hasattr(sublime, 'cache_path'):
+        try:
+            map_tables(os.path.join(sublime.cache_path(), 'UnicodeMath'))
+        except EnvironmentError as e:
+            log(u'can\'t map symbol tables, using private copy: {0}'.format(e))
+        usage.path = os.path.join(sublime.cache_path(), 'UnicodeMath', 'usage.json')
+        usage.load()
+    reload_settings()
+    get_settings().add_on_change('UnicodeMath', reload_settings)
 
-def enabled(name, default=True):
-    return get_settings().get(name, default)
 
+def plugin_unloaded():
+    save_usage()
 
-def replacement(m, instant=False):
+
+def get_line_contents(view, location):
     """
-    Returns the conversion for regex match m (with groups 'symbol', 'prefix'
-    and 'chars'), None if no conversion is possible.
-    If instant=True, restricts to conversions suitable for instant insertion
+    Returns the contents of the line at the given location
     """
-    symbol = m.groupdict().get('symbol')
-    prefix = m.groupdict().get('prefix')
-    chars = m.groupdict().get('chars')
-
-    if symbol is not None:
-        # Accept explicit symbol names; in instant mode, refuse \^... and \_...
-        # (which are left to subs/supers) and ambigous prefixes
-        rep = symbol_by_name(symbol)
-        if rep and (not instant or (not is_script(symbol) and symbol_by_prefix(symbol, unique=True))):
-            return rep
-
-        # Convert unambiguous prefixes
-        if enabled('accept_prefixes'):
-            rep = symbol_by_prefix(symbol, unique=True)
-            if rep:
-                return rep
-
-        # Convert subscript and superscripts, but not in instant mode (it would
-        # convert immediately at \^ or \_)
-        if enabled('convert_sub_super') and is_script(symbol) and (not instant or symbol.endswith(" ")):
-            script_char, chars = get_script(symbol.strip())
-            reps = [symbol_by_name(script_char + ch) for ch in chars]
-            if all(reps):
-                return ''.join(reps)
-
-        # Convert Unicode codes
-        if enabled('convert_codes'):
-            rep = symbol_by_code(u'\\' + symbol)
-            if rep:
-                return rep
-
-        # In instant mode, accept symbols when followed by an invalid character.
-        # For instance, when typing "x" in "\alphax", recognize that "\alpha"
-        # was completed, and replace it.
-        if instant and symbol is not None and len(symbol) > 1 and not is_script(symbol):
-            prefix, suffix = symbol[:-1], symbol[-1]
-            rep = symbol_by_name(prefix)
-            comp_full = symbol_by_prefix(symbol, unique=False)
-
-            if rep and not comp_full:
-                rep = symbol_by_name(prefix)
-                if rep:
-                    return rep + suffix
+    return view.substr(sublime.Region(view.line(location).a, location))
+
+
+def match_prefix(view, location, prefix_re):
+    """
+    Searches escape before location, reading only as much of line as needed
+    """
+    return search_prefix(
+        lambda begin, end: view.substr(sublime.Region(begin, end)),
+        view.line(location).a, location, prefix_re)
 
-    # Substitute prefix combinations (\\prefix\...)
-    if prefix is not None and (not instant or chars and chars.endswith(" ")):
-        reps = [symbol_by_name(prefix + ch) for ch in chars.strip()]
-        if all(reps):
-            return ''.join(reps)
 
 def can_convert(view, instant=False):
     """
@@ -109,57 +170,143 @@ def can_convert(view, instant=False):
     hard to detect whether this on_modified was called as result of previous call of command
     If instant=True, only allows conversions suitables for automatic insertion
     """
-    prefix_re = UNICODE_PREFIX_RE if enabled('convert_list') else UNICODE_SYMBOL_PREFIX_RE
+    prefix_re = prefix_regex(config)
     for r in view.sel():
         if r.a == r.b:
-            line = get_line_contents(view, r.a)
-            m = prefix_re.search(line)
-            if m and replacement(m, instant) is not None:
+            m = match_prefix(view, r.a, prefix_re)
+            if m and replacement(m, instant, config) is not None:
                 return True
     return False
 
 
+_syntax_allowed = {}
+
+
 def syntax_allowed(view):
     """
     Returns whether syntax in view is not in ignore list
+    Results are cached by syntax setting, cache is cleared on settings change
     """
-    syntax_in_view = SYNTAX_RE.match(view.settings().get('syntax'))
-    if syntax_in_view and syntax_in_view.group('name').lower() in get_settings().get('ignore_syntax', []):
-        return False
-    return True
+    syntax = view.settings().get('syntax')
+    allowed = _syntax_allowed.get(syntax)
+    if allowed is None:
+        syntax_in_view = SYNTAX_RE.match(syntax or '')
+        allowed = not (syntax_in_view and syntax_in_view.group('name').lower() in settings.ignore_syntax)
+        _syntax_allowed[syntax] = allowed
+    return allowed
 
 
 def find_rev(view, r):
-    # Go through all prefixes starting from longest
-    # Returns prefix length and its names + possibly code
+    # Find longest symbol ending at r.end() with reverse index
+    # Returns its region and names + code
     # Order:
     #   - name - may not present
     #   - synonyms... - may not presend
     #   - code - always present
-    max_len = max(map(lambda v: len(v), maths.direct.values()))
-    prefix = get_line_contents(view, r.end())
-
-    for i in reversed(range(1, max_len + 1)):
-        cur_pref = prefix[-i:]
-        if len(cur_pref) < i:
-            continue
-        names = list(map(lambda n: u'\\' + n, names_by_symbol(cur_pref)))
-        if names or i == 1:  # For prefix 1 (one symbol) there always exists code
-            names.append(u''.join([code_by_symbol(c) for c in cur_pref]))
-        if names:
-            region = sublime.Region(r.end() - i, r.end())
-            return (region, names)
-    return (r, [])
+    index = reverse_index()
+    begin = max(view.line(r.end()).a, r.end() - index.max_len)
+    prefix = view.substr(sublime.Region(begin, r.end()))
+    if not prefix:
+        return (r, [])
+
+    size = index.longest_suffix(prefix) or 1  # For one symbol there always exists code
+    cur_pref = prefix[-size:]
+    names = list(map(lambda n: u'\\' + n, names_by_symbol(cur_pref)))
+    names.append(u''.join([code_by_symbol(c) for c in cur_pref]))
+    return (sublime.Region(r.end() - size, r.end()), names)
+
+
+def used_names(m, rep):
+    """
+    Names of symbols converted by escape match m to rep, to count their usage
+    """
+    symbol = m.groupdict().get('symbol')
+    if symbol is None:
+        return [m.group('prefix') + ch for ch in m.group('chars').strip()]
+    if rep == symbol_by_name(symbol):
+        return [symbol]
+    # In instant mode escape may be followed by one invalid char
+    completed = symbol_by_name(symbol[:-1]) if len(symbol) > 1 else None
+    if completed and rep == completed + symbol[-1]:
+        return [symbol[:-1]]
+    # Unique prefix accepted as full name
+    names = list(islice(completion_index().extensions(symbol), 2))
+    if len(names) == 1 and rep == symbol_by_name(names[0]):
+        return names
+    return []
+
+
+def completion_flags(complete):
+    """
+    Keep ranked order and query truncated completions again on each char
+    Complete list is filtered by Sublime itself as user types
+    """
+    flags = 0
+    if settings.rank_completions:
+        flags |= getattr(sublime, 'INHIBIT_REORDER', 0)
+    if not complete:
+        flags |= getattr(sublime, 'DYNAMIC_COMPLETIONS', 0)
+    return flags
+
+
+def completion_list(completions, flags):
+    """
+    Makes completions result from (trigger, annotation, contents)
+    """
+    if hasattr(sublime, 'CompletionList'):
+        return sublime.CompletionList([
+            sublime.CompletionItem(
+                trigger, annotation=annotation, completion=contents,
+                completion_format=sublime.COMPLETION_FORMAT_SNIPPET)
+            for trigger, annotation, contents in completions], flags)
+    completions = [(trigger + '\t' + annotation, contents) for trigger, annotation, contents in completions]
+    return (completions, flags) if flags else completions
 
 
 class UnicodeMathComplete(sublime_plugin.EventListener):
+    def __init__(self):
+        # completion contents of last query -> name
+        self.offered = {}
+        # (tables, usage and settings state, prefix, pairs) of last complete result
+        self.last = (None, None, [])
+
+    def completions(self, prefix):
+        """
+        Returns (name, symbol) pairs for names starting with prefix, most used
+        first, at most completions_limit of them, and whether they are all
+        Used names are selected by heap from usage statistics and the rest is
+        taken from stream of index only as much as needed; when previous result
+        had all completions for a part of prefix, it's filtered instead
+        """
+        require_names(prefix)
+        key = (tables_generation(), usage.changes, settings_generation)
+        last_key, last_prefix, last_pairs = self.last
+        if last_key == key and prefix.startswith(last_prefix):
+            return ([pair for pair in last_pairs if pair[0].startswith(prefix)], True)
+
+        # Truncated list would be only filtered as user types, so truncate only
+        # where completions can be queried again on each char (ST4)
+        limit = settings.completions_limit if hasattr(sublime, 'DYNAMIC_COMPLETIONS') else 0
+        pairs = []
+        if settings.rank_completions:
+            for name in usage.top(prefix, limit and limit + 1):
+                rep = symbol_by_name(name)
+                if rep:
+                    pairs.append((name, rep))
+        used = set(name for name, _ in pairs)
+        rest = (pair for pair in completion_index().iter_completions(prefix) if pair[0] not in used)
+        pairs.extend(islice(rest, limit + 1 - len(pairs)) if limit else rest)
+        if limit and len(pairs) > limit:
+            return (pairs[:limit], False)
+        self.last = (key, prefix, pairs)
+        return (pairs, True)
+
     def on_query_completions(self, view, prefix, locations):
         if not syntax_allowed(view):
             return
 
-        prefix_re = UNICODE_PREFIX_RE if enabled('convert_list') else UNICODE_SYMBOL_PREFIX_RE
-        line = get_line_contents(view, locations[0])
-        m = prefix_re.search(line)
+        prefix_re = prefix_regex(config)
+        m = match_prefix(view, locations[0], prefix_re)
         if not m:
             return
 
@@ -167,17 +314,46 @@ class UnicodeMathComplete(sublime_plugin.EventListener):
         pre = m.groupdict().get('prefix')
         chars = m.groupdict().get('chars')
 
-        # returns completions
         if pre is not None:
             def drop_prefix(pr, s):
                 return s[len(pr):]
             pref = '\\\\' + pre + '\\' + ''.join(chars)
-            completions = [(pref + drop_prefix(pre, k) + '\t' + maths.direct[k], '\\' + pref + drop_prefix(pre, k)) for k in maths.direct.keys() if k.startswith(pre)]
-            completions.extend([(pref + drop_prefix(pre, k) + '\t' + maths.direct[synonyms.direct[k]], '\\' + pref + drop_prefix(pre, k)) for k in synonyms.direct.keys() if k.startswith(pre)])
+            pairs, complete = self.completions(pre)
+            completions = [
+                (k, pref + drop_prefix(pre, k), v, '\\' + pref + drop_prefix(pre, k))
+                for k, v in pairs]
+        elif settings.completion_mode == 'fuzzy' and len(symbol) >= 3:
+            # Sublime hides completions, which don't match typed text, so typed text is
+            # kept in trigger of names, that don't contain it as subsequence
+            typed = u'\\' + symbol
+            completions = []
+            for k, v in search_symbols(symbol, settings.completions_limit or None):
+                trigger = u'\\' + k
+                if not is_subsequence(typed.lower(), trigger.lower()):
+                    trigger = typed + u' ' + trigger
+                completions.append((k, trigger, v, v))
+            self.offered = dict((contents, k) for k, _, _, contents in completions)
+            flags = getattr(sublime, 'INHIBIT_REORDER', 0) | getattr(sublime, 'DYNAMIC_COMPLETIONS', 0)
+            return completion_list([c[1:] for c in completions], flags)
         else:
-            completions = [('\\' + k + '\t' + maths.direct[k], maths.direct[k]) for k in maths.direct.keys() if k.startswith(symbol)]
-            completions.extend([('\\' + k + '\t' + maths.direct[synonyms.direct[k]], maths.direct[synonyms.direct[k]]) for k in synonyms.direct.keys() if k.startswith(symbol)])
-        return sorted(completions, key=lambda k: k[0])
+            pairs, complete = self.completions(symbol)
+            completions = [(k, '\\' + k, v, v) for k, v in pairs]
+        self.offered = dict((contents, k) for k, _, _, contents in completions)
+        return completion_list([c[1:] for c in completions], completion_flags(complete))
+
+    def on_post_text_command(self, view, command_name, args):
+        if command_name not in ('commit_completion', 'insert_best_completion') or not self.offered:
+            return
+        sel = view.sel()
+        if not len(sel):
+            return
+        pt = sel[0].b
+        for size in set(map(len, self.offered)):
+            name = self.offered.get(view.substr(sublime.Region(pt - size, pt)))
+            if name is not None:
+                record_usage([name])
+                break
+        self.offered = {}
 
     def on_query_context(self, view, key, operator, operand, match_all):
         if key == 'unicode_math_syntax_allowed':
@@ -185,15 +361,16 @@ class UnicodeMathComplete(sublime_plugin.EventListener):
         elif key == 'unicode_math_can_convert':
             return can_convert(view)
         elif key == 'unicode_math_convert_on_space_enabled':
-            return enabled('convert_on_space')
+            return settings.convert_on_space
         else:
             return False
 
 
 class UnicodeMathConvert(sublime_plugin.TextCommand):
     def run(self, edit, instant=False):
-        self.prefix_re = UNICODE_PREFIX_RE if enabled('convert_list') else UNICODE_SYMBOL_PREFIX_RE
-        self.search_re = UNICODE_RE if enabled('convert_list') else UNICODE_SYMBOL_RE
+        self.config = config
+        self.prefix_re = prefix_regex(self.config)
+        self.search_re = search_regex(self.config)
 
         for r in self.view.sel():
             if r.a == r.b:
@@ -202,43 +379,53 @@ class UnicodeMathConvert(sublime_plugin.TextCommand):
                 self.convert_selection(edit, r, instant)
 
     def convert_prefix(self, edit, r, instant):
-        line = get_line_contents(self.view, r.a)
-        m = self.prefix_re.search(line)
+        m = match_prefix(self.view, r.a, self.prefix_re)
         if m:
-            rep = replacement(m, instant)
+            rep = replacement(m, instant, self.config)
             if rep is not None:
-                if enabled('trailing_space'):
+                record_usage(used_names(m, rep))
+                if settings.trailing_space:
                     rep += " "
                 self.view.replace(edit, sublime.Region(r.begin() - (m.end() - m.start()), r.begin()), rep)
 
     def convert_selection(self, edit, r, instant):
         contents = self.view.substr(r)
-        replaces = []
-        # collect replacements as pairs (region, string to replace with)
-        for m in self.search_re.finditer(contents):
-            rep = replacement(m, instant)
-            if rep is not None:
-                replaces.append((sublime.Region(r.begin() + m.start(), r.begin() + m.end()), rep))
-        # apply all replacements
-        offset = 0
-        for reg, rep in replaces:
-            self.view.replace(edit, sublime.Region(reg.begin() + offset, reg.end() + offset), rep)
-            offset += len(rep) - reg.size()
+        if settings.selection_single_replace:
+            # build converted text in one pass and apply it with one edit
+            converted = convert_text(contents, instant, self.config)
+            if converted != contents:
+                self.view.replace(edit, r, converted)
+        else:
+            # replace only escapes, that changed, starting from the end, so that
+            # earlier regions stay valid
+            replaces = []
+            for m in self.search_re.finditer(contents):
+                rep = replacement(m, instant, self.config)
+                if rep is not None and rep != m.group(0):
+                    replaces.append((sublime.Region(r.begin() + m.start(), r.begin() + m.end()), rep))
+            for reg, rep in reversed(replaces):
+                self.view.replace(edit, reg, rep)
+
 
 class UnicodeMathConvertInstantly(sublime_plugin.TextChangeListener):
     def __init__(self):
         super().__init__()
         self.running = False
+        # (begin, end, whether begin is line start) of text known to have no backslash
+        self.no_backslash = None
 
     def on_text_changed(self, changes):
         # Sublime only marks changes as processed once we return. But we run 'unicode_math_convert'
         # which causes text changes; as a result, Sublime will re-invoke this listener before we
         # return, and re-send the same changes since they're not technically "processed" yet. To
         # avoid confusion and infinite loops, disable all the recursive calls.
-        if self.running:
+        if self.running or not settings.convert_instantly:
+            self.no_backslash = None
+            return
+        if self.cannot_convert(changes):
             return
         # only convert when adding text (length of old content == 0)
-        if enabled('convert_instantly') and any(c.len_utf8 == 0 for c in changes):
+        if any(c.len_utf8 == 0 for c in changes):
             view = sublime.active_window().active_view()
             if view is not None and syntax_allowed(view):
                 if can_convert(view, instant=True):
@@ -246,6 +433,40 @@ class UnicodeMathConvertInstantly(sublime_plugin.TextChangeListener):
                     view.run_command('unicode_math_convert', args={'instant': True})
                     self.running = False
 
+    def cannot_convert(self, changes):
+        """
+        Cheap check, that single inserted text can't complete an escape, because
+        there is no backslash within max_escape_length() chars before it on its line
+        Known backslash-free part of line is cached, so typing plain text doesn't
+        touch view at all
+        """
+        if len(changes) != 1 or changes[0].len_utf8 != 0:
+            self.no_backslash = None
+            return False
+        pt, text = changes[0].a.pt, changes[0].str
+        end = pt + len(text)
+        newline = text.rfind('\n')
+        if newline != -1:
+            pt, text = pt + newline + 1, text[newline + 1:]
+            self.no_backslash = (pt, pt, True)
+        if '\\' in text:
+            self.no_backslash = None
+            return False
+        limit = max_escape_length()
+        cached = self.no_backslash
+        if cached is not None and cached[0] <= pt <= cached[1] and (cached[2] or end - limit >= cached[0]):
+            self.no_backslash = (cached[0], cached[1] + len(text), cached[2])
+            return True
+        view = self.buffer.primary_view()
+        line_start = view.line(pt).a
+        begin = max(line_start, end - limit)
+        if '\\' in view.substr(sublime.Region(begin, end)):
+            self.no_backslash = None
+            return False
+        self.no_backslash = (begin, end, begin == line_start)
+        return True
+
+
 class UnicodeMathConvertBack(sublime_plugin.TextCommand):
     """
     Convert symbols back to either name or code
@@ -253,6 +474,8 @@ class UnicodeMathConvertBack(sublime_plugin.TextCommand):
     def run(self, edit, code=False):
         if len(self.view.sel()) == 1:
             (region, names) = find_rev(self.view, self.view.sel()[0])
+            if not names:
+                return
             if code:
                 self.view.replace(edit, region, names[-1])
             else:
@@ -278,6 +501,69 @@ class UnicodeMathConvertBack(sublime_plugin.TextCommand):
             'end': self.region.end()})
 
 
+class UnicodeMathConvertBackAll(sublime_plugin.TextCommand):
+    """
+    Convert all non-ASCII symbols in selections (or whole buffer, if nothing
+    is selected) back to escapes
+    policy is one of 'name', 'shortest' or 'code', see convert_back_policy setting
+    """
+    def run(self, edit, policy=None, unknown_to_code=False):
+        if policy is None:
+            policy = settings.convert_back_policy
+        regions = [r for r in self.view.sel() if not r.empty()]
+        if not regions:
+            regions = [sublime.Region(0, self.view.size())]
+        for r in reversed(regions):
+            contents = self.view.substr(r)
+            converted = convert_back_text(contents, policy, unknown_to_code)
+            if converted != contents:
+                self.view.replace(edit, r, converted)
+
+
+class UnicodeMathStylize(sublime_plugin.TextCommand):
+    """
+    Converts letters and digits in selections (or words at cursors) to math alphabet
+    style, asks for style if it's not given
+    style is one of escape prefixes of alphabets: 'mbf', 'mit', 'Bbb', 'mfrak', ...
+    """
+    def run(self, edit, style=None):
+        if style is None:
+            self.styles = [st for st, _ in ALPHABET_STYLE_NAMES]
+            items = [u'{0} ({1})'.format(stylize(name.capitalize(), st), st) for st, name in ALPHABET_STYLE_NAMES]
+            self.view.window().show_quick_panel(items, self.on_done)
+            return
+        for r in reversed(self.view.sel()):
+            region = r if not r.empty() else self.view.word(r)
+            contents = self.view.substr(region)
+            styled = stylize(contents, style)
+            if styled != contents:
+                self.view.replace(edit, region, styled)
+
+    def on_done(self, idx):
+        if idx == -1:
+            return
+        self.view.run_command('unicode_math_stylize', {'style': self.styles[idx]})
+
+
+class UnicodeMathScript(sublime_plugin.TextCommand):
+    """
+    Converts selections (or words at cursors) to superscript ('^') or subscript ('_')
+    If partial=True, chars without such form are left as is, otherwise words with them
+    are; these chars are shown in status bar
+    """
+    def run(self, edit, script='^', partial=False):
+        missing = set()
+        for r in reversed(self.view.sel()):
+            region = r if not r.empty() else self.view.word(r)
+            contents = self.view.substr(region)
+            converted, chars = convert_script_text(contents, script, partial)
+            missing.update(chars)
+            if converted != contents:
+                self.view.replace(edit, region, converted)
+        if missing:
+            sublime.status_message(u'UnicodeMath: no {0} for {1}'.format(SCRIPT_NAMES[script], u' '.join(u"'{0}'".format(ch) for ch in sorted(missing))))
+
+
 class UnicodeMathInsertSpace(sublime_plugin.TextCommand):
     def run(self, edit):
         for r in self.view.sel():
@@ -296,17 +582,40 @@ class UnicodeMathReplaceInView(sublime_plugin.TextCommand):
                 self.view.replace(edit, r, replace_with)
 
 
+def panel_item(text, symbol):
+    """
+    Quick panel item with symbol code as annotation where available
+    """
+    if hasattr(sublime, 'QuickPanelItem'):
+        return sublime.QuickPanelItem(text, annotation=code_by_symbol(symbol) or u'')
+    return text
+
+
+@generation_cached
+def insert_items():
+    """
+    Returns (quick panel items, symbols) for UnicodeMathInsert, they are rebuilt only
+    after symbols or synonyms are updated
+    Items are QuickPanelItem with symbol code as annotation where available, item
+    text is symbol, name and synonyms, so that panel can be filtered by any of them
+    Emoji are included only if they are loaded: items are prefetched in background,
+    where emoji are never loaded, so that tables aren't changed under main thread
+    """
+    synonyms_of = {}
+    for synonym, name in synonyms.direct.items():
+        synonyms_of.setdefault(name, []).append(synonym)
+    items = []
+    symbols = []
+    for k, v in maths.direct.items():
+        items.append(panel_item(u' '.join([v, k] + synonyms_of.get(k, [])), v))
+        symbols.append(v)
+    return (items, symbols)
+
+
 class UnicodeMathInsert(sublime_plugin.WindowCommand):
     def run(self):
-        self.menu_items = []
-        self.symbols = []
-        for k, v in maths.direct.items():
-            value = v + ' ' + k
-            if k in synonyms.inverse:
-                value += ' ' + ' '.join(synonyms.inverse[k])
-            self.menu_items.append(value)
-            self.symbols.append(v)
-
+        require_names()
+        self.menu_items, self.symbols = insert_items()
         self.window.show_quick_panel(self.menu_items, self.on_done)
 
     def on_done(self, idx):
@@ -318,3 +627,38 @@ class UnicodeMathInsert(sublime_plugin.WindowCommand):
 
         view.run_command('unicode_math_replace_in_view', {
             'replace_with': self.symbols[idx]})
+
+
+SEARCH_LIMIT = 200
+
+
+class UnicodeMathSearch(sublime_plugin.WindowCommand):
+    """
+    Asks for part of name and shows symbols found by substring or fuzzy match
+    """
+    def run(self, query=None):
+        if query is None:
+            self.window.show_input_panel('Symbol name:', '', self.on_query, None, None)
+        else:
+            self.on_query(query)
+
+    def on_query(self, query):
+        self.pairs = search_symbols(query.strip().lstrip('\\'), SEARCH_LIMIT)
+        if not self.pairs:
+            sublime.status_message(u'UnicodeMath: no symbol matches {0}'.format(query))
+            return
+        self.window.show_quick_panel([panel_item(u'{0} {1}'.format(v, k), v) for k, v in self.pairs], self.on_done)
+
+    def on_done(self, idx):
+        if idx == -1:
+            return
+        view = self.window.active_view()
+        if not view:
+            return
+
+        view.run_command('unicode_math_replace_in_view', {
+            'replace_with': self.pairs[idx][1]})
+
+
+if int(sublime.version()) < 3000:
+    plugin_loaded()
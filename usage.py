@@ -0,0 +1,107 @@
+"""
+Usage statistics of symbol names to rank completions
+Doesn't depend on sublime, saving is left to caller, so that it can be done in background
+"""
+
+import heapq
+import json
+import os
+import time
+
+
+HALF_LIFE = 30 * 24 * 3600.0
+MAX_ENTRIES = 2000
+MIN_SCORE = 0.01
+
+
+class UsageStore:
+    """
+    Counts of accepted names, that decay with half-life in seconds
+    Instead of decaying all counts, new uses weigh more as time goes from epoch, so that
+    recording is one dict update; scores are rescaled to new epoch when weight grows large
+    """
+    def __init__(self, path=None, half_life=HALF_LIFE, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.half_life = half_life
+        self.max_entries = max_entries
+        self.epoch = time.time()
+        self.scores = {}
+        self.dirty = False
+        # Changes on each record, so that rankings can be cached
+        self.changes = 0
+
+    def weight(self, now):
+        return 2.0 ** ((now - self.epoch) / self.half_life)
+
+    def record(self, name, now=None):
+        """
+        Counts one use of name
+        """
+        if now is None:
+            now = time.time()
+        if self.weight(now) > 1e6:
+            self.rebase(now)
+        self.scores[name] = self.scores.get(name, 0.0) + self.weight(now)
+        self.dirty = True
+        self.changes += 1
+
+    def rebase(self, now):
+        """
+        Moves epoch to now, dropping names with negligible counts
+        """
+        scale = 1.0 / self.weight(now)
+        self.scores = dict((k, v * scale) for k, v in self.scores.items() if v * scale >= MIN_SCORE)
+        self.epoch = now
+
+    def count(self, name, now=None):
+        """
+        Returns decayed count of uses of name
+        """
+        return self.scores.get(name, 0.0) / self.weight(time.time() if now is None else now)
+
+    def top(self, prefix=u'', limit=None):
+        """
+        Returns used names starting with prefix, most used first, names used equally
+        are sorted; at most limit names are selected by heap without sorting all of them
+        """
+        scores = self.scores
+        names = (name for name in scores if name.startswith(prefix))
+        key = lambda name: (-scores[name], name)
+        return heapq.nsmallest(limit, names, key=key) if limit else sorted(names, key=key)
+
+    def load(self):
+        """
+        Reads saved counts, missing or broken file is treated as empty
+        """
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            epoch, scores = float(data['epoch']), data['scores']
+        except (EnvironmentError, ValueError, KeyError, TypeError):
+            return
+        self.epoch = epoch
+        self.scores = dict((k, float(v)) for k, v in scores.items())
+        self.dirty = False
+        self.changes += 1
+
+    def save(self):
+        """
+        Writes counts, if they are changed since last save, only max_entries most used
+        names are kept; file is replaced at once, so that it's never seen partial
+        """
+        if not self.dirty or self.path is None:
+            return
+        self.dirty = False
+        # Items are listed at once, so uses recorded meanwhile don't break iteration
+        scores = sorted(list(self.scores.items()), key=lambda kv: -kv[1])[:self.max_entries]
+        data = {
+            'epoch': self.epoch,
+            'scores': dict((k, round(v, 3)) for k, v in scores),
+        }
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        tmp = '{0}.{1}.tmp'.format(self.path, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(data, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp, self.path)